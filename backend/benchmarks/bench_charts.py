@@ -0,0 +1,163 @@
+"""
+Compare per-chart render time and PNG size of the legacy pyplot renderer
+(dpi=300, tight_layout, bbox_inches='tight') with render_chart, which
+also writes the WebP, 1x and SVG derivatives (their sizes are listed too).
+
+Usage (from backend/):
+    python benchmarks/bench_charts.py [--runs 5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from charts import chart_jobs, derivative_path, render_chart  # noqa: E402
+import matplotlib.pyplot as plt  # noqa: E402
+
+
+def sample_profile() -> Dict:
+    """Profile data shaped like a typical analysis result."""
+    rng = np.random.default_rng(0)
+    languages = ["Python", "JavaScript", "TypeScript", "Go", "Rust", "Shell"]
+    shares = rng.dirichlet(np.ones(len(languages))) * 100
+    stars = np.cumsum(rng.integers(0, 40, 24))
+    return {
+        "top_languages": [
+            {"name": name, "percentage": round(float(share), 1)}
+            for name, share in zip(languages, shares)
+        ],
+        "contribution_summary": {
+            "star_timeline": [
+                {"month": f"{2024 + i // 12}-{i % 12 + 1:02d}", "stars": int(s)}
+                for i, s in enumerate(stars)
+            ],
+            "activity_matrix": rng.poisson(3, (7, 24)).tolist()
+        }
+    }
+
+
+def legacy_language_chart(languages: List[Dict], path: str) -> str:
+    """Language pie as rendered before the Figure/Agg engine."""
+    names = [lang["name"] for lang in languages]
+    percentages = [lang["percentage"] for lang in languages]
+    colors = ['#3572A5', '#f1e05a', '#e34c26', '#563d7c', '#b07219',
+              '#00ADD8', '#89e051', '#178600', '#A97BFF', '#DA5B0B']
+    fig, ax = plt.subplots(figsize=(10, 8))
+    wedges, texts, autotexts = ax.pie(
+        percentages, labels=names, autopct='%1.1f%%', startangle=90,
+        colors=colors[:len(names)], textprops={'fontsize': 12, 'weight': 'bold'}
+    )
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontsize(11)
+    ax.set_title('Top Programming Languages', fontsize=16, weight='bold', pad=20)
+    plt.tight_layout()
+    plt.savefig(path, dpi=300, bbox_inches='tight', facecolor='white')
+    plt.close()
+    return path
+
+
+def legacy_star_timeline(timeline: List[Dict], path: str) -> str:
+    """Star timeline as rendered before the Figure/Agg engine."""
+    months = [item["month"] for item in timeline]
+    stars = [item["stars"] for item in timeline]
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.plot(months, stars, marker='o', linewidth=2.5, markersize=8,
+            color='#2ea44f', markerfacecolor='#1a7f37', markeredgewidth=2,
+            markeredgecolor='white')
+    ax.fill_between(range(len(months)), stars, alpha=0.3, color='#2ea44f')
+    ax.set_xlabel('Month', fontsize=12, weight='bold')
+    ax.set_ylabel('Cumulative Stars', fontsize=12, weight='bold')
+    ax.set_title('Star Growth Timeline', fontsize=16, weight='bold', pad=20)
+    plt.xticks(rotation=45, ha='right')
+    ax.grid(True, alpha=0.3, linestyle='--')
+    ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{int(x):,}'))
+    plt.tight_layout()
+    plt.savefig(path, dpi=300, bbox_inches='tight', facecolor='white')
+    plt.close()
+    return path
+
+
+def legacy_contribution_heatmap(profile_data: Dict, path: str) -> str:
+    """Activity heatmap as rendered before the Figure/Agg engine."""
+    days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+    data = np.asarray(profile_data["contribution_summary"]["activity_matrix"], dtype=float)
+    fig, ax = plt.subplots(figsize=(14, 5))
+    im = ax.imshow(data, cmap='Greens', aspect='auto')
+    ax.set_xticks(np.arange(24))
+    ax.set_yticks(np.arange(7))
+    ax.set_xticklabels([f'{h:02d}:00' if h % 3 == 0 else '' for h in range(24)])
+    ax.set_yticklabels(days)
+    plt.setp(ax.get_xticklabels(), rotation=45, ha="right", rotation_mode="anchor")
+    ax.set_xlabel('Hour of Day', fontsize=12, weight='bold')
+    ax.set_ylabel('Day of Week', fontsize=12, weight='bold')
+    ax.set_title('Commit Activity Pattern', fontsize=16, weight='bold', pad=20)
+    cbar = plt.colorbar(im, ax=ax)
+    cbar.set_label('Commits', rotation=270, labelpad=20, weight='bold')
+    plt.tight_layout()
+    plt.savefig(path, dpi=300, bbox_inches='tight', facecolor='white')
+    plt.close()
+    return path
+
+
+def measure(render: Callable[[], str], runs: int) -> Dict:
+    """Best-of-runs wall time (ms) and output size (KB) of a renderer."""
+    render()  # warm up font and colormap caches
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        path = render()
+        times.append(time.perf_counter() - start)
+    return {"ms": min(times) * 1000, "kb": os.path.getsize(path) / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per chart")
+    args = parser.parse_args()
+
+    profile = sample_profile()
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = {
+            "languages": (
+                lambda: legacy_language_chart(profile["top_languages"], os.path.join(tmp, "legacy_languages.png")),
+                lambda: render_chart("languages", profile["top_languages"], os.path.join(tmp, "languages.png"))
+            ),
+            "stars": (
+                lambda: legacy_star_timeline(profile["contribution_summary"]["star_timeline"], os.path.join(tmp, "legacy_stars.png")),
+                lambda: render_chart("stars", profile["contribution_summary"]["star_timeline"], os.path.join(tmp, "stars.png"))
+            ),
+            "contributions": (
+                lambda: legacy_contribution_heatmap(profile, os.path.join(tmp, "legacy_contributions.png")),
+                lambda: render_chart("contributions", *chart_jobs(profile)["contributions"][1],
+                                     os.path.join(tmp, "contributions.png"))
+            ),
+        }
+
+        print(f"{'chart':<15}{'legacy ms':>11}{'new ms':>9}{'speedup':>9}{'legacy KB':>11}{'new KB':>9}"
+              f"{'webp KB':>9}{'1x webp KB':>12}{'svg KB':>8}")
+        totals = {"legacy": 0.0, "new": 0.0}
+        for name, (legacy, new) in cases.items():
+            before = measure(legacy, args.runs)
+            after = measure(new, args.runs)
+            path = new()
+            derivatives = [
+                os.path.getsize(derivative_path(path, fmt, scale)) / 1024
+                for fmt, scale in (("webp", 2), ("webp", 1), ("svg", 2))
+            ]
+            totals["legacy"] += before["ms"]
+            totals["new"] += after["ms"]
+            print(f"{name:<15}{before['ms']:>11.1f}{after['ms']:>9.1f}{before['ms'] / after['ms']:>8.1f}x"
+                  f"{before['kb']:>11.1f}{after['kb']:>9.1f}"
+                  f"{derivatives[0]:>9.1f}{derivatives[1]:>12.1f}{derivatives[2]:>8.1f}")
+        print(f"{'total':<15}{totals['legacy']:>11.1f}{totals['new']:>9.1f}{totals['legacy'] / totals['new']:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
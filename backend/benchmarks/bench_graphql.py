@@ -0,0 +1,93 @@
+"""
+Run a full GraphQL-backend analysis against the local GitHub API stub
+(stub_graphql.py) and count the requests it makes.
+
+Checks that analyze_profile fills the usual profile_data shape from the
+canned pages, and exits with status 1 if a section is missing or empty,
+if the analysis requested anything the stub has no answer for, or if it
+took more GraphQL queries than --max-queries. --org analyzes the stub
+organisation instead of the stub user.
+
+Usage (from backend/):
+    python benchmarks/bench_graphql.py [--repos 100] [--page-size 25] [--max-queries 10] [--org]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_graphql import GHOST, LOGIN, ORG, StubGitHub  # noqa: E402
+
+PROFILE_KEYS = (
+    "username", "name", "stats", "top_languages", "ai_summary", "top_repositories",
+    "contribution_summary", "collaboration_score", "collaborators", "analysis_coverage"
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repos", type=int, default=100, help="Repositories of the analyzed account")
+    parser.add_argument("--page-size", type=int, default=25, help="Repositories per GraphQL page")
+    parser.add_argument("--max-queries", type=int, default=10, help="Maximum GraphQL queries of one analysis")
+    parser.add_argument("--org", action="store_true", help="Analyze the stub organisation")
+    args = parser.parse_args()
+    login = ORG if args.org else LOGIN
+
+    with StubGitHub(args.repos) as stub:
+        # Only the stub is configured: no pool, cache or snapshots from the environment
+        os.environ.update({
+            "GITHUB_BACKEND": "graphql",
+            "GITHUB_TOKEN": "stub-token",
+            "GITHUB_TOKENS": "",
+            "GITHUB_APP_ID": "",
+            "GITHUB_API_URL": stub.url,
+            "GITHUB_GRAPHQL_URL": f"{stub.url}/graphql",
+            "GITHUB_GRAPHQL_PAGE_SIZE": str(args.page_size),
+            "GITHUB_HTTP_CACHE": "off",
+            "GITHUB_SNAPSHOT_DIR": "off",
+            "COMMIT_COUNT_STRATEGY": "",
+            "PERSON_NAMES": "batch"
+        })
+        from github_analyzer import GitHubAnalyzer
+
+        start = time.perf_counter()
+        profile = GitHubAnalyzer().analyze_profile(login)
+        elapsed = time.perf_counter() - start
+
+        queries, rest = stub.count("graphql"), stub.count("rest")
+        unhandled = list(stub.unhandled)
+
+    people = {person["username"]: person["name"] for person in profile["collaborators"]["top_people"]}
+    print(f"{'account':<24}{login:>8}")
+    print(f"{'repositories':<24}{args.repos:>8}")
+    print(f"{'GraphQL queries':<24}{queries:>8}  (budget {args.max_queries})")
+    print(f"{'REST requests':<24}{rest:>8}")
+    print(f"{'analysis ms':<24}{elapsed * 1000:>8.0f}")
+    print(f"{'total commits':<24}{profile['stats']['total_commits']:>8}")
+    print(f"{'top languages':<24}{len(profile['top_languages']):>8}")
+    print(f"{'people':<24}{profile['collaborators']['total_unique_people']:>8}")
+    print(f"coverage: {profile['analysis_coverage']}")
+
+    failures = [f"profile_data has no {key}" for key in PROFILE_KEYS if not profile.get(key)]
+    # Organisations author no commits
+    if not args.org and profile["stats"]["total_commits"] <= 0:
+        failures.append("no commits were counted")
+    if not profile["contribution_summary"].get("activity_matrix"):
+        failures.append("the activity matrix is empty")
+    if people.get("dev-1") != "Dev 1":
+        failures.append("collaborator names were not resolved")
+    if GHOST in people and people[GHOST] != GHOST:
+        failures.append("the unresolvable contributor is not listed by login")
+    if queries > args.max_queries:
+        failures.append(f"{queries} GraphQL queries (budget {args.max_queries})")
+    failures.extend(f"unexpected request: {request}" for request in unhandled)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
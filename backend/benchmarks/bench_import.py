@@ -0,0 +1,134 @@
+"""
+Cold-start budget of the API process.
+
+Imports main in fresh interpreters with `python -X importtime` and prints
+the slowest modules it imports, then starts the server (uvicorn, default
+configuration, so startup hooks such as the chart and job workers run as
+deployed) and times its first response. Exits with status 1 if the import
+or the first response takes longer than its budget, or if the import loads
+a module that only chart rendering or GitHub analysis needs (those are
+imported on first use).
+
+Usage (from backend/):
+    python benchmarks/bench_import.py [--runs 5] [--budget-ms 1000] [--startup-budget-ms 3000]
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must not be imported by `import main`
+LAZY_MODULES = ("matplotlib", "numpy", "PIL", "scipy", "github", "requests", "plotly", "pandas")
+
+
+def import_times() -> List[Tuple[int, str, int]]:
+    """
+    Import main in a fresh interpreter.
+
+    Returns:
+        (depth, module, cumulative microseconds) per imported module
+    """
+    # data/ and charts/ go to a scratch directory
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR)
+    with tempfile.TemporaryDirectory() as cwd:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import main"],
+            cwd=cwd, env=env, capture_output=True, text=True
+        )
+    if result.returncode != 0:
+        sys.exit(f"import main failed:\n{result.stderr}")
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((depth, name.strip(), int(cumulative)))
+    return modules
+
+
+def first_response_time(timeout: float = 60) -> float:
+    """
+    Start the server in a fresh interpreter and time its first response.
+
+    Returns:
+        Seconds from process start until GET /health answers
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    with tempfile.TemporaryDirectory() as cwd:
+        start = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", BACKEND_DIR, "--port", str(port)],
+            cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            while time.perf_counter() - start < timeout:
+                if server.poll() is not None:
+                    sys.exit("the server exited during startup")
+                try:
+                    with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1):
+                        return time.perf_counter() - start
+                except OSError:
+                    time.sleep(0.02)
+            sys.exit(f"the server did not respond within {timeout:.0f} s")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main_time(modules: List[Tuple[int, str, int]]) -> int:
+    """Cumulative microseconds of the main import."""
+    return next(us for depth, name, us in modules if name == "main")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Interpreters to start (the fastest counts)")
+    parser.add_argument("--budget-ms", type=float, default=1000, help="Maximum import time of main")
+    parser.add_argument("--startup-budget-ms", type=float, default=3000,
+                        help="Maximum time from server start to its first response")
+    parser.add_argument("--top", type=int, default=10, help="Slowest direct imports of main to list")
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(args.runs)]
+    fastest = min(runs, key=main_time)
+    total_ms = main_time(fastest) / 1000
+    direct = {name: us for depth, name, us in fastest if depth == 1}
+
+    print(f"{'module':<30}{'ms':>9}")
+    for name, us in sorted(direct.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{name:<30}{us / 1000:>9.1f}")
+    print(f"{'import main':<30}{total_ms:>9.1f}  (budget {args.budget_ms:.0f})")
+    startup_ms = min(first_response_time() for _ in range(args.runs)) * 1000
+    print(f"{'first response':<30}{startup_ms:>9.1f}  (budget {args.startup_budget_ms:.0f})")
+
+    loaded = sorted({
+        name for modules in runs for _, name, _ in modules
+        if name.split(".")[0] in LAZY_MODULES
+    })
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"import main took {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    if startup_ms > args.startup_budget_ms:
+        failures.append(f"first response took {startup_ms:.0f} ms (budget {args.startup_budget_ms:.0f} ms)")
+    if loaded:
+        roots = sorted({name.split(".")[0] for name in loaded})
+        failures.append(f"import main loaded modules that must be imported lazily: {', '.join(roots)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
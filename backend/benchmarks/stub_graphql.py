@@ -0,0 +1,320 @@
+"""
+Local stub of the GitHub API for exercising the GraphQL backend offline.
+
+Replays canned pages of one user's and one organisation's profile: the
+GraphQL queries of
+graphql_backend.py, person_directory.py and the commit counter's
+contribution calendar at /graphql, and the few REST resources the GraphQL
+backend still reads (/rate_limit and repository collaborators and
+contributors). Every request is recorded, and anything else is answered
+with 404 and listed in `unhandled`.
+
+Usage (from backend/):
+    python benchmarks/stub_graphql.py [--port 8765] [--repos 100]
+
+then point GITHUB_API_URL at http://127.0.0.1:8765, GITHUB_GRAPHQL_URL at
+http://127.0.0.1:8765/graphql and analyze the user `stub-user` or the
+organisation `stub-org` with GITHUB_BACKEND=graphql and any GITHUB_TOKEN.
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+LOGIN = "stub-user"
+ORG = "stub-org"
+LANGUAGES = ["Python", "JavaScript", "TypeScript", "Go", "Rust", "Shell"]
+PEOPLE = [f"dev-{i}" for i in range(7)]
+# Contributor whose account was deleted: its node ID no longer resolves
+GHOST = "deleted-dev"
+
+
+def _timestamp(days_ago: float, hour: int = 12) -> str:
+    """UTC timestamp days_ago days back, at the given hour."""
+    day = int(time.time() // 86400 - days_ago)
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(day * 86400 + hour * 3600))
+
+
+def _person(login: str, contributions: Optional[int] = None) -> Dict:
+    """REST user listing entry."""
+    person = {
+        "login": login,
+        "id": sum(map(ord, login)),
+        "node_id": f"U_{login}",
+        "avatar_url": f"https://avatars.example.com/{login}",
+        "url": f"/users/{login}",
+        "type": "User"
+    }
+    if contributions is not None:
+        person["contributions"] = contributions
+    return person
+
+
+def canned_repos(count: int, owner: str = LOGIN) -> List[Dict]:
+    """GraphQL `Repository` nodes of a stub owner, in name order."""
+    repos = []
+    for i in range(count):
+        language = LANGUAGES[i % len(LANGUAGES)]
+        repos.append({
+            "name": f"repo-{i:03d}",
+            "nameWithOwner": f"{owner}/repo-{i:03d}",
+            "description": f"Stub repository {i}",
+            "url": f"https://github.com/{owner}/repo-{i:03d}",
+            "homepageUrl": None,
+            "isFork": i % 10 == 9,
+            "createdAt": _timestamp(30 * (count - i)),
+            "updatedAt": _timestamp(i % 60),
+            "pushedAt": _timestamp(i % 60),
+            "stargazerCount": (i * 37) % 250,
+            "forkCount": (i * 11) % 40,
+            "owner": {"login": owner},
+            "primaryLanguage": {"name": language},
+            "languages": {"edges": [
+                {"size": 50000 + i * 1000, "node": {"name": language}},
+                {"size": 2000 + i * 10, "node": {"name": "Shell"}}
+            ]},
+            "repositoryTopics": {"nodes": [{"topic": {"name": language.lower()}}]},
+            "openIssues": {"totalCount": i % 4},
+            "openPulls": {"totalCount": i % 3},
+            "issues": {"nodes": [{"number": n} for n in range(1, i % 4 + 1)]},
+            "pullRequests": {"nodes": [
+                {"number": 100 + n, "author": {"login": PEOPLE[(i + n) % len(PEOPLE)]},
+                 "reviews": {"totalCount": n % 3}}
+                for n in range(i % 3)
+            ]},
+            "defaultBranchRef": {"target": {
+                "authored": {"totalCount": 10 + i % 25},
+                "history": {"nodes": [
+                    {"authoredDate": _timestamp(n, hour=(9 + i + n) % 24)} for n in range(10 + i % 25)
+                ]}
+            }}
+        })
+    return repos
+
+
+def canned_people(repo_index: int) -> Tuple[List[Dict], List[Dict]]:
+    """REST (collaborators, contributors) of a repository, owner included."""
+    collaborators = [_person(LOGIN)]
+    if repo_index % 5 == 0:
+        collaborators.append(_person(PEOPLE[repo_index % len(PEOPLE)]))
+    contributors = [_person(LOGIN, 40)] + [
+        _person(PEOPLE[(repo_index + n) % len(PEOPLE)], 5 + n) for n in range(1, repo_index % 3 + 1)
+    ]
+    if repo_index == 0:
+        contributors.append(_person(GHOST, 1))
+    return collaborators, contributors
+
+
+class StubGitHub:
+    """
+    Stub GitHub API server, serving in a background thread.
+
+    Attributes:
+        requests: (method, path) of every request, in order
+        unhandled: Requests the stub has no canned answer for
+    """
+
+    def __init__(self, repo_count: int = 100, port: int = 0):
+        """
+        Initialize the server.
+
+        Args:
+            repo_count: Repositories of the stub user and of the stub organisation
+            port: Port to listen on (0 picks a free one)
+        """
+        self.repos = {login: canned_repos(repo_count, login) for login in (LOGIN, ORG)}
+        self.requests: List[Tuple[str, str]] = []
+        self.unhandled: List[str] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the REST API (GraphQL is served at {url}/graphql)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, kind: str) -> int:
+        """Requests received so far, of kind "graphql" or "rest"."""
+        with self._lock:
+            return len([path for _, path in self.requests if (path == "/graphql") == (kind == "graphql")])
+
+    def start(self) -> "StubGitHub":
+        """Start serving in a daemon thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-github", daemon=True)
+        self._thread.start()
+        return self
+
+    def shutdown(self) -> None:
+        """Stop serving and close the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubGitHub":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    def graphql(self, query: str, variables: Dict) -> Dict:
+        """GraphQL response payload of a query."""
+        if "nodes(ids:" in query:
+            nodes, errors = [], []
+            for node_id in variables["ids"]:
+                login = node_id[len("U_"):]
+                if login == GHOST:
+                    nodes.append(None)
+                    errors.append({"message": f"Could not resolve to a node with the global id of '{node_id}'"})
+                else:
+                    nodes.append({"login": login, "name": login.replace("-", " ").title()})
+            return {"data": {"nodes": nodes}, "errors": errors} if errors else {"data": {"nodes": nodes}}
+
+        login = variables.get("login")
+        if "contributionsCollection" in query:
+            if login != LOGIN:
+                return {"data": {"user": None}, "errors": [
+                    {"message": f"Could not resolve to a User with the login of '{login}'"}
+                ]}
+            years = re.findall(r"(y\d{4}): contributionsCollection", query)
+            return {"data": {"user": {year: {"totalCommitContributions": 250} for year in years}}}
+
+        if login not in self.repos:
+            return {"data": {"repositoryOwner": None}, "errors": [
+                {"message": f"Could not resolve to a RepositoryOwner with the login of '{login}'"}
+            ]}
+        repos = self.repos[login]
+
+        if "pageInfo" in query:
+            start = int(variables.get("after") or 0)
+            end = start + variables["pageSize"]
+            nodes = repos[start:end]
+            if not variables.get("isUser", True):
+                # @include(if: $isUser) drops the authored commit count
+                nodes = [
+                    dict(node, defaultBranchRef={"target": {
+                        "history": node["defaultBranchRef"]["target"]["history"]
+                    }})
+                    for node in nodes
+                ]
+            return {"data": {"repositoryOwner": {"repositories": {
+                "pageInfo": {"hasNextPage": end < len(repos), "endCursor": str(end)},
+                "nodes": nodes
+            }}}}
+
+        if login == ORG:
+            return {"data": {"repositoryOwner": {
+                "__typename": "Organization",
+                "id": f"O_{ORG}",
+                "login": ORG,
+                "name": "Stub Org",
+                "description": "Canned organisation of the local GitHub API stub",
+                "avatarUrl": f"https://avatars.example.com/{ORG}",
+                "websiteUrl": None,
+                "location": "Localhost",
+                "email": None,
+                "twitterUsername": None,
+                "createdAt": _timestamp(30 * len(repos) + 30),
+                "updatedAt": _timestamp(1),
+                "repositories": {"totalCount": len(repos)}
+            }}}
+
+        return {"data": {"repositoryOwner": {
+            "__typename": "User",
+            "id": f"U_{LOGIN}",
+            "login": LOGIN,
+            "name": "Stub User",
+            "bio": "Canned profile of the local GitHub API stub",
+            "avatarUrl": f"https://avatars.example.com/{LOGIN}",
+            "websiteUrl": None,
+            "location": "Localhost",
+            "email": "",
+            "twitterUsername": None,
+            "company": None,
+            "isHireable": False,
+            "createdAt": _timestamp(30 * len(repos) + 30),
+            "updatedAt": _timestamp(1),
+            "repositories": {"totalCount": len(repos)},
+            "gists": {"totalCount": 3},
+            "followers": {"totalCount": 42},
+            "following": {"totalCount": 7}
+        }}}
+
+    def rest(self, path: str) -> Optional[object]:
+        """REST response body of a GET, or None if the stub has none."""
+        if path == "/rate_limit":
+            resource = {"limit": 5000, "remaining": 5000, "reset": int(time.time()) + 3600, "used": 0}
+            return {"resources": {"core": resource, "search": resource, "graphql": resource}, "rate": resource}
+
+        match = re.fullmatch(rf"/repos/({LOGIN}|{ORG})/repo-(\d+)/(collaborators|contributors)", path)
+        if match and int(match.group(2)) < len(self.repos[match.group(1)]):
+            collaborators, contributors = canned_people(int(match.group(2)))
+            return collaborators if match.group(3) == "collaborators" else contributors
+        return None
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                stub._record("GET", path)
+                self._reply(stub.rest(path))
+
+            def do_POST(self):
+                path = self.path.split("?")[0]
+                stub._record("POST", path)
+                if path != "/graphql":
+                    self._reply(None)
+                    return
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                self._reply(stub.graphql(body["query"], body.get("variables") or {}))
+
+            def _reply(self, body) -> None:
+                if body is None:
+                    with stub._lock:
+                        stub.unhandled.append(f"{self.command} {self.path}")
+                    body = {"message": "Not Found"}
+                    status = 404
+                else:
+                    status = 200
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("X-RateLimit-Limit", "5000")
+                self.send_header("X-RateLimit-Remaining", "5000")
+                self.send_header("X-RateLimit-Reset", str(int(time.time()) + 3600))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _record(self, method: str, path: str) -> None:
+        with self._lock:
+            self.requests.append((method, path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--repos", type=int, default=100, help="Repositories of the stub user and organisation")
+    args = parser.parse_args()
+
+    with StubGitHub(args.repos, args.port) as stub:
+        print(f"Serving {LOGIN} and {ORG} ({args.repos} repositories each) at {stub.url} (GraphQL at {stub.url}/graphql)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import matplotlib
+matplotlib.use('Agg')  # Use non-interactive backend
+from matplotlib import style as mpl_style
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from PIL import Image
+
+from charts import CHART_STYLE, CHART_WIDTH, derivative_path, write_atomic
+from chart_specs import LANGUAGE_COLORS, estimate_activity
+
+
+# Drawing code: imported by whatever renders (chart workers, or the analysis
+# thread with CHART_WORKERS=0) on first use, so processes that only serve
+# profiles and chart files never load matplotlib, numpy or Pillow
+
+# The style is applied once per process; figures never touch pyplot state
+mpl_style.use(CHART_STYLE)
+
+
+class ChartTemplate:
+    """
+    Pre-styled figure layout of one chart kind.
+    
+    Margins are fixed per chart kind instead of measured with tight_layout
+    or bbox_inches='tight', which each cost an extra draw of the figure.
+    """
+    
+    def __init__(self, figsize: Tuple[float, float], margins: Dict[str, float]):
+        """
+        Args:
+            figsize: Figure size in inches (sets the proportions and text scale)
+            margins: subplots_adjust() fractions
+        """
+        self.figsize = figsize
+        self.margins = margins
+    
+    def new_figure(self) -> Tuple[Figure, Axes]:
+        """New figure and axes, sized to CHART_WIDTH pixels wide."""
+        fig = Figure(figsize=self.figsize, dpi=CHART_WIDTH / self.figsize[0], facecolor='white')
+        FigureCanvasAgg(fig)
+        fig.subplots_adjust(**self.margins)
+        return fig, fig.add_subplot()
+
+
+TEMPLATES = {
+    "languages": ChartTemplate((10, 8), {"left": 0.08, "right": 0.92, "bottom": 0.04, "top": 0.9}),
+    "stars": ChartTemplate((12, 6), {"left": 0.09, "right": 0.98, "bottom": 0.2, "top": 0.9}),
+    "contributions": ChartTemplate((14, 5), {"left": 0.07, "right": 1.0, "bottom": 0.2, "top": 0.88}),
+    "repo_stats": ChartTemplate((12, 6), {"left": 0.07, "right": 0.98, "bottom": 0.3, "top": 0.9}),
+}
+
+
+def save_figure(fig: Figure, path: str) -> str:
+    """
+    Write a figure's derivatives and return the canonical path.
+    
+    The figure is rasterized once at its own resolution; the 1x images are
+    box-downscaled from that (which keeps flat areas flat, so they compress
+    well). Each file is written atomically, and the PNG at path is written
+    last: once it exists, all derivatives are complete.
+    """
+    write_atomic(derivative_path(path, "svg"), lambda tmp: fig.savefig(
+        tmp, format="svg", facecolor='white', metadata={"Date": None}))
+    
+    fig.canvas.draw()
+    image = Image.fromarray(np.asarray(fig.canvas.buffer_rgba())).convert("RGB")
+    small = image.reduce(2)
+    # At quality 90 WebP keeps text clean at under half the size of PNG
+    # (lossless WebP is no smaller and several times slower to encode)
+    write_atomic(derivative_path(path, "webp", 1), lambda tmp: small.save(tmp, "WEBP", quality=90, method=2))
+    write_atomic(derivative_path(path, "png", 1), lambda tmp: small.save(tmp, "PNG"))
+    write_atomic(derivative_path(path, "webp", 2), lambda tmp: image.save(tmp, "WEBP", quality=90, method=2))
+    return write_atomic(path, lambda tmp: image.save(tmp, "PNG"))
+
+
+# Render functions take plain data and an output path, so they can run in
+# worker processes; each returns the path written, or None if there is no data
+
+
+def render_language_chart(languages: List[Dict], path: str) -> Optional[str]:
+    """Render a pie chart for language distribution."""
+    if not languages:
+        return None
+    
+    names = [lang["name"] for lang in languages]
+    percentages = [lang["percentage"] for lang in languages]
+    
+    fig, ax = TEMPLATES["languages"].new_figure()
+    
+    wedges, texts, autotexts = ax.pie(
+        percentages,
+        labels=names,
+        autopct='%1.1f%%',
+        startangle=90,
+        colors=LANGUAGE_COLORS[:len(names)],
+        textprops={'fontsize': 12, 'weight': 'bold'}
+    )
+    
+    # Enhance text
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontsize(11)
+    
+    ax.set_title('Top Programming Languages', fontsize=16, weight='bold', pad=20)
+    
+    return save_figure(fig, path)
+
+
+def render_star_timeline(timeline: List[Dict], path: str) -> Optional[str]:
+    """Render a line chart for star growth over time."""
+    if not timeline:
+        return None
+    
+    months = [item["month"] for item in timeline]
+    stars = [item["stars"] for item in timeline]
+    
+    fig, ax = TEMPLATES["stars"].new_figure()
+    
+    # Create gradient effect
+    ax.plot(months, stars, marker='o', linewidth=2.5, markersize=8, 
+            color='#2ea44f', markerfacecolor='#1a7f37', markeredgewidth=2, 
+            markeredgecolor='white')
+    
+    ax.fill_between(range(len(months)), stars, alpha=0.3, color='#2ea44f')
+    
+    ax.set_xlabel('Month', fontsize=12, weight='bold')
+    ax.set_ylabel('Cumulative Stars', fontsize=12, weight='bold')
+    ax.set_title('Star Growth Timeline', fontsize=16, weight='bold', pad=20)
+    
+    # Rotate x-axis labels
+    for label in ax.get_xticklabels():
+        label.set(rotation=45, ha='right')
+    
+    # Add grid
+    ax.grid(True, alpha=0.3, linestyle='--')
+    
+    # Format y-axis
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'{int(x):,}'))
+    
+    return save_figure(fig, path)
+
+
+def render_contribution_heatmap(activity_matrix: Optional[List[List[int]]], top_repositories: List[Dict],
+                                path: str) -> Optional[str]:
+    """
+    Render a heatmap of commit activity by weekday and hour.
+    
+    Uses the punch-card activity matrix of the contribution summary;
+    profiles analyzed before it existed fall back to an estimate from
+    the top repositories' update times.
+    """
+    days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+    
+    if activity_matrix and np.asarray(activity_matrix).any():
+        data = np.asarray(activity_matrix, dtype=float)
+        title = 'Commit Activity Pattern'
+        colorbar_label = 'Commits'
+    else:
+        data = estimate_activity(top_repositories)
+        if data is None:
+            return None
+        title = 'Repository Activity Pattern'
+        colorbar_label = 'Activity Level'
+    
+    fig, ax = TEMPLATES["contributions"].new_figure()
+    
+    im = ax.imshow(data, cmap='Greens', aspect='auto')
+    
+    # Set ticks
+    hours = list(range(24))
+    ax.set_xticks(np.arange(len(hours)))
+    ax.set_yticks(np.arange(len(days)))
+    ax.set_xticklabels([f'{h:02d}:00' if h % 3 == 0 else '' for h in hours])
+    ax.set_yticklabels(days)
+    
+    # Rotate the tick labels
+    for label in ax.get_xticklabels():
+        label.set(rotation=45, ha="right", rotation_mode="anchor")
+    
+    ax.set_xlabel('Hour of Day', fontsize=12, weight='bold')
+    ax.set_ylabel('Day of Week', fontsize=12, weight='bold')
+    ax.set_title(title, fontsize=16, weight='bold', pad=20)
+    
+    # Add colorbar
+    cbar = fig.colorbar(im, ax=ax)
+    cbar.set_label(colorbar_label, rotation=270, labelpad=20, weight='bold')
+    
+    return save_figure(fig, path)
+
+
+def render_repo_stats_chart(repos: List[Dict], path: str) -> Optional[str]:
+    """Render a bar chart comparing repository statistics."""
+    if not repos or len(repos) < 2:
+        return None
+    
+    names = [repo["name"][:20] for repo in repos[:5]]  # Truncate long names
+    stars = [repo["stars"] for repo in repos[:5]]
+    forks = [repo["forks"] for repo in repos[:5]]
+    
+    x = np.arange(len(names))
+    width = 0.35
+    
+    fig, ax = TEMPLATES["repo_stats"].new_figure()
+    
+    bars1 = ax.bar(x - width/2, stars, width, label='Stars', color='#ffd33d')
+    bars2 = ax.bar(x + width/2, forks, width, label='Forks', color='#2188ff')
+    
+    ax.set_xlabel('Repository', fontsize=12, weight='bold')
+    ax.set_ylabel('Count', fontsize=12, weight='bold')
+    ax.set_title('Top Repositories - Stars vs Forks', fontsize=16, weight='bold', pad=20)
+    ax.set_xticks(x)
+    ax.set_xticklabels(names, rotation=45, ha='right')
+    ax.legend()
+    
+    # Add value labels on bars
+    for bars in [bars1, bars2]:
+        for bar in bars:
+            height = bar.get_height()
+            ax.annotate(f'{int(height)}',
+                       xy=(bar.get_x() + bar.get_width() / 2, height),
+                       xytext=(0, 3),
+                       textcoords="offset points",
+                       ha='center', va='bottom', fontsize=9)
+    
+    return save_figure(fig, path)
+
+
+def warm() -> None:
+    """Draw a small figure so fonts and colormaps are loaded."""
+    fig = Figure(figsize=(1, 1))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.imshow(np.zeros((2, 2)), cmap='Greens')
+    ax.set_title('warm', weight='bold')
+    fig.canvas.draw()
@@ -0,0 +1,147 @@
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+
+# Bump when the shape of a spec changes
+CHART_SPEC_VERSION = 1
+
+# Language colors, in order of the top languages
+LANGUAGE_COLORS = ['#3572A5', '#f1e05a', '#e34c26', '#563d7c', '#b07219',
+                   '#00ADD8', '#89e051', '#178600', '#A97BFF', '#DA5B0B']
+
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+
+def estimate_activity(repos: List[Dict]):
+    """Estimate a 7x24 activity grid (numpy array) from repository update times."""
+    if not repos:
+        return None
+
+    import numpy as np
+
+    # Initialize data matrix
+    data = np.zeros((7, 24))
+
+    # Analyze repo update times to estimate activity pattern
+    for repo in repos:
+        if repo.get("updated_at"):
+            try:
+                update_time = datetime.fromisoformat(repo["updated_at"].replace('Z', '+00:00'))
+                day_of_week = update_time.weekday()  # 0 = Monday
+                hour = update_time.hour
+                # Weight by repo activity (stars + forks)
+                weight = 1 + ((repo.get("stars") or 0) + (repo.get("forks") or 0)) * 0.1
+                data[day_of_week][hour] += weight
+            except:
+                pass
+
+    # If we have sparse data, add some smoothing
+    if data.max() > 0:
+        from scipy.ndimage import gaussian_filter
+        try:
+            data = gaussian_filter(data, sigma=0.8)
+        except:
+            pass  # If scipy not available, use raw data
+    else:
+        # No data available, create a minimal placeholder pattern
+        data = np.ones((7, 24)) * 0.5
+
+    return data
+
+
+def language_spec(profile_data: Dict) -> Optional[Dict]:
+    """Pie chart of the top languages' shares."""
+    languages = profile_data.get("top_languages")
+    if not languages:
+        return None
+    return {
+        "type": "pie",
+        "title": "Top Programming Languages",
+        "labels": [lang["name"] for lang in languages],
+        "values": [lang["percentage"] for lang in languages],
+        "colors": LANGUAGE_COLORS[:len(languages)],
+        "unit": "%"
+    }
+
+
+def star_timeline_spec(profile_data: Dict) -> Optional[Dict]:
+    """Line chart of cumulative stars per month."""
+    timeline = profile_data.get("contribution_summary", {}).get("star_timeline")
+    if not timeline:
+        return None
+    return {
+        "type": "line",
+        "title": "Star Growth Timeline",
+        "x_label": "Month",
+        "y_label": "Cumulative Stars",
+        "x": [item["month"] for item in timeline],
+        "y": [item["stars"] for item in timeline],
+        "color": "#2ea44f"
+    }
+
+
+def contribution_heatmap_spec(profile_data: Dict) -> Optional[Dict]:
+    """
+    Weekday x hour heatmap of commit activity.
+
+    The 7x24 matrix is sent as a flat row-major array (Monday 00:00 first).
+    Profiles without a punch-card matrix get the estimate from their top
+    repositories' update times, as in the rendered chart.
+    """
+    activity_matrix = profile_data.get("contribution_summary", {}).get("activity_matrix")
+    if activity_matrix and any(any(row) for row in activity_matrix):
+        values = [int(v) for row in activity_matrix for v in row]
+        title = "Commit Activity Pattern"
+        value_label = "Commits"
+    else:
+        data = estimate_activity(profile_data.get("top_repositories", []))
+        if data is None:
+            return None
+        values = [round(float(v), 2) for v in data.ravel()]
+        title = "Repository Activity Pattern"
+        value_label = "Activity Level"
+    return {
+        "type": "heatmap",
+        "title": title,
+        "x_label": "Hour of Day",
+        "y_label": "Day of Week",
+        "value_label": value_label,
+        "rows": DAYS,
+        "columns": [f"{h:02d}:00" for h in range(24)],
+        "values": values,
+        "color_scale": "Greens"
+    }
+
+
+CHART_SPECS: Dict[str, Callable[[Dict], Optional[Dict]]] = {
+    "languages": language_spec,
+    "stars": star_timeline_spec,
+    "contributions": contribution_heatmap_spec,
+}
+
+
+def chart_spec(name: str, profile_data: Dict) -> Optional[Dict]:
+    """
+    Chart-ready data and declarative spec of one of a profile's charts.
+
+    Args:
+        name: Chart name (languages, stars or contributions)
+        profile_data: Analyzed profile
+
+    Returns:
+        Spec dict, or None if the chart is unknown or has no data
+    """
+    build = CHART_SPECS.get(name)
+    spec = build(profile_data) if build else None
+    if spec is None:
+        return None
+    return {"version": CHART_SPEC_VERSION, "chart": name, **spec}
+
+
+def chart_spec_urls(username: str, profile_data: Dict) -> Dict[str, str]:
+    """URLs of the chart specs a profile has data for."""
+    return {
+        name: f"/charts/{username}/{name}.json"
+        for name, build in CHART_SPECS.items()
+        if build(profile_data) is not None
+    }
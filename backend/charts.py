@@ -1,242 +1,564 @@
 import os
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
-import plotly.express as px
-from typing import Dict, List
-import numpy as np
-from datetime import datetime
-import calendar
+import re
+import hashlib
+import json
+import multiprocessing
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from importlib.metadata import version
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
+# Locks a user's chart folder across processes (POSIX only; elsewhere
+# publishing is only serialized within a process)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
-class ChartGenerator:
-    """Generates visualization charts for GitHub profile data."""
+# Charts are shown in half-width cards (about 600 CSS pixels wide); render
+# them at twice that so they stay sharp on high-density screens
+CHART_WIDTH = int(os.getenv("CHART_WIDTH", 1200))
+
+# Matplotlib style of every chart (applied by chart_render)
+CHART_STYLE = 'seaborn-v0_8-darkgrid'
+
+
+# Every chart is written as these derivatives: PNG and WebP at 2x
+# (CHART_WIDTH) and 1x (half of it), and SVG. The 2x PNG is the canonical
+# file listed in profiles; get_chart picks the best one for each client.
+CHART_FORMATS = ("png", "webp", "svg")
+CHART_MEDIA_TYPES = {"png": "image/png", "webp": "image/webp", "svg": "image/svg+xml"}
+
+
+def derivative_path(path: str, fmt: str = "png", scale: int = 2) -> str:
+    """
+    Path of a chart derivative, from the path of its canonical 2x PNG.
     
-    def __init__(self, output_dir: str = "charts", username: str = None):
-        """Initialize chart generator with output directory."""
-        self.base_dir = output_dir
-        self.username = username
-        
-        # Create user-specific directory if username provided
-        if username:
-            self.output_dir = os.path.join(output_dir, username)
+    e.g. languages.0123456789abcdef.png -> languages.0123456789abcdef.1x.webp
+    """
+    base = path[:-len(".png")]
+    if fmt == "svg":
+        return f"{base}.svg"
+    suffix = "" if scale == 2 else f".{scale}x"
+    return f"{base}{suffix}.{fmt}"
+
+
+def chart_derivatives(path: str) -> List[str]:
+    """All derivative paths of a chart, the canonical 2x PNG last."""
+    return [
+        derivative_path(path, "svg"),
+        derivative_path(path, "webp", 1),
+        derivative_path(path, "png", 1),
+        derivative_path(path, "webp", 2),
+        path
+    ]
+
+
+def write_atomic(path: str, write: Callable[[str], None]) -> str:
+    """
+    Write a file under a temporary name in its directory, then rename it
+    into place, so readers (other threads, processes or servers sharing the
+    directory) never see a partial file.
+    
+    Args:
+        path: Final path
+        write: Writes the file to the path it is given
+    
+    Returns:
+        path
+    """
+    tmp = os.path.join(os.path.dirname(path), f".{uuid.uuid4().hex}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return path
+
+def preferred_format(accept: str) -> str:
+    """
+    Chart format for an Accept header: the supported type with the highest
+    quality, earliest listed on ties; wildcards (and no header) mean PNG.
+    """
+    best, best_quality = "png", 0.0
+    for item in accept.split(","):
+        media_type, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        media_type = media_type.strip().lower()
+        if media_type in ("image/*", "*/*"):
+            fmt = "png"
         else:
-            self.output_dir = output_dir
-            
-        os.makedirs(self.output_dir, exist_ok=True)
-        
-        # Set style
-        plt.style.use('seaborn-v0_8-darkgrid')
+            fmt = next((f for f, t in CHART_MEDIA_TYPES.items() if t == media_type), None)
+        if fmt and quality > best_quality:
+            best, best_quality = fmt, quality
+    return best
+
+
+def negotiate_chart(path: str, accept: str, width: Optional[int] = None) -> str:
+    """
+    Best derivative of a chart for a client.
     
-    def set_username(self, username: str):
-        """Set username and create corresponding directory."""
-        self.username = username
-        self.output_dir = os.path.join(self.base_dir, username)
-        os.makedirs(self.output_dir, exist_ok=True)
+    Args:
+        path: Canonical 2x PNG of the chart
+        accept: Accept header
+        width: Pixel width the client will display (1x is used up to
+            CHART_WIDTH / 2)
     
-    def generate_language_chart(self, languages: List[Dict], filename: str = "languages.png"):
-        """Generate a pie chart for language distribution."""
-        if not languages:
-            return None
-        
-        names = [lang["name"] for lang in languages]
-        percentages = [lang["percentage"] for lang in languages]
-        
-        # Create color palette
-        colors = ['#3572A5', '#f1e05a', '#e34c26', '#563d7c', '#b07219', 
-                  '#00ADD8', '#89e051', '#178600', '#A97BFF', '#DA5B0B']
-        
-        fig, ax = plt.subplots(figsize=(10, 8))
-        
-        wedges, texts, autotexts = ax.pie(
-            percentages,
-            labels=names,
-            autopct='%1.1f%%',
-            startangle=90,
-            colors=colors[:len(names)],
-            textprops={'fontsize': 12, 'weight': 'bold'}
-        )
-        
-        # Enhance text
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontsize(11)
-        
-        ax.set_title('Top Programming Languages', fontsize=16, weight='bold', pad=20)
-        
-        plt.tight_layout()
-        output_path = os.path.join(self.output_dir, filename)
-        plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
-        
-        return output_path
+    Returns:
+        Path of an existing derivative (path itself if there is no better one)
+    """
+    fmt = preferred_format(accept)
+    scale = 1 if width and width <= CHART_WIDTH // 2 else 2
+    candidate = derivative_path(path, fmt, scale)
+    return candidate if os.path.exists(candidate) else path
+
+
+# Published chart files: {name}.{version hash}[.{scale}x].{ext}
+CHART_VERSION_RE = re.compile(r"^(?P<name>.+?)\.(?P<hash>[0-9a-f]{16})(?:\.(?P<scale>[0-9])x)?\.(?P<ext>[a-z0-9]+)$")
+
+# Bump when the drawing code changes, so earlier renders are not reused
+RENDERER_VERSION = 3
+
+
+@lru_cache(maxsize=None)
+def matplotlib_version() -> str:
+    """Installed matplotlib version, read without importing it."""
+    return version("matplotlib")
+
+
+def chart_input_key(name: str, data: tuple) -> str:
+    """
+    Hash of a chart's input data and of everything else that affects its
+    pixels (renderer version, matplotlib version, style and width).
+    """
+    material = json.dumps({
+        "chart": name,
+        "data": data,
+        "renderer": RENDERER_VERSION,
+        "matplotlib": matplotlib_version(),
+        "style": CHART_STYLE,
+        "width": CHART_WIDTH
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def link_or_copy(source: str, destination: str) -> None:
+    """Hard-link source to destination, copying where links are not supported."""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+# Per-user order of published chart versions, newest first (see publish_chart)
+VERSIONS_MANIFEST = ".versions.json"
+FOLDER_LOCK = ".versions.lock"
+_manifest_lock = threading.Lock()
+
+
+@contextmanager
+def folder_lock(output_dir: str) -> Iterator[None]:
+    """
+    Hold the publishing lock of a user's chart folder, shared by the threads
+    of this process and (with fcntl) by every other process: the API
+    process, job workers and other server workers.
+    """
+    with _manifest_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(output_dir, FOLDER_LOCK), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def read_versions(output_dir: str) -> Dict[str, List[str]]:
+    """Published version hashes per chart name of a user's chart folder, newest first."""
+    try:
+        with open(os.path.join(output_dir, VERSIONS_MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def publish_chart(stored: str, output_dir: str, keep: int = 2) -> str:
+    """
+    Publish a stored chart (with its derivatives) into a user's chart folder
+    under its versioned name, so its URLs can be cached forever, and delete
+    older versions of the same chart.
     
-    def generate_star_timeline(self, timeline: List[Dict], filename: str = "stars.png"):
-        """Generate a line chart for star growth over time."""
-        if not timeline:
-            return None
-        
-        months = [item["month"] for item in timeline]
-        stars = [item["stars"] for item in timeline]
-        
-        fig, ax = plt.subplots(figsize=(12, 6))
-        
-        # Create gradient effect
-        ax.plot(months, stars, marker='o', linewidth=2.5, markersize=8, 
-                color='#2ea44f', markerfacecolor='#1a7f37', markeredgewidth=2, 
-                markeredgecolor='white')
-        
-        ax.fill_between(range(len(months)), stars, alpha=0.3, color='#2ea44f')
-        
-        ax.set_xlabel('Month', fontsize=12, weight='bold')
-        ax.set_ylabel('Cumulative Stars', fontsize=12, weight='bold')
-        ax.set_title('Star Growth Timeline', fontsize=16, weight='bold', pad=20)
-        
-        # Rotate x-axis labels
-        plt.xticks(rotation=45, ha='right')
-        
-        # Add grid
-        ax.grid(True, alpha=0.3, linestyle='--')
-        
-        # Format y-axis
-        ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{int(x):,}'))
-        
-        plt.tight_layout()
-        output_path = os.path.join(self.output_dir, filename)
-        plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
-        
-        return output_path
+    Published files are hard links to the store (copies where links are
+    not supported), so identical charts of different users are stored once.
+    Their mtime is shared by every user, so the order of each user's
+    versions is kept in the folder's VERSIONS_MANIFEST instead. Linking,
+    the manifest update and pruning happen under folder_lock, so processes
+    publishing different versions for one user never delete each other's.
     
-    def generate_contribution_heatmap(self, profile_data: Dict, filename: str = "contributions.png"):
-        """Generate a heatmap showing contribution patterns based on repo activity."""
-        repos = profile_data.get("top_repositories", [])
-        if not repos:
-            return None
-        
-        # Analyze actual repository update patterns
-        days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-        
-        # Initialize data matrix
-        data = np.zeros((7, 24))
-        
-        # Analyze repo update times to estimate activity pattern
-        for repo in repos:
-            if repo.get("updated_at"):
+    Args:
+        stored: Chart in the store, e.g. charts/_store/languages.0123456789abcdef.png
+        output_dir: User's chart folder, e.g. charts/octocat
+        keep: Versions to keep, including the new one (the previous version
+            stays available to pages that were loaded before the refresh)
+    
+    Returns:
+        Path of the published chart, e.g. charts/octocat/languages.0123456789abcdef.png
+    """
+    published = os.path.join(output_dir, os.path.basename(stored))
+    # Keeps the stored chart from being pruned while it is in use
+    os.utime(stored)
+    
+    name, current = CHART_VERSION_RE.match(os.path.basename(published)).group("name", "hash")
+    with folder_lock(output_dir):
+        for source in chart_derivatives(stored):
+            target = os.path.join(output_dir, os.path.basename(source))
+            if os.path.exists(target) or not os.path.exists(source):
+                continue
+            write_atomic(target, lambda tmp: link_or_copy(source, tmp))
+        
+        # Files of every version of this chart in the folder
+        versions = {}
+        for filename in os.listdir(output_dir):
+            match = CHART_VERSION_RE.match(filename)
+            if match and match.group("name") == name:
+                versions.setdefault(match.group("hash"), []).append(os.path.join(output_dir, filename))
+        
+        manifest = read_versions(output_dir)
+        order = manifest.get(name)
+        if order is None:
+            # Published before the manifest existed: newest first by mtime
+            def mtime(digest):
                 try:
-                    from datetime import datetime
-                    update_time = datetime.fromisoformat(repo["updated_at"].replace('Z', '+00:00'))
-                    day_of_week = update_time.weekday()  # 0 = Monday
-                    hour = update_time.hour
-                    # Weight by repo activity (stars + forks)
-                    weight = 1 + (repo.get("stars", 0) + repo.get("forks", 0)) * 0.1
-                    data[day_of_week][hour] += weight
-                except:
+                    return max(os.path.getmtime(path) for path in versions[digest])
+                except OSError:
+                    return 0
+            order = sorted(versions, key=mtime, reverse=True)
+        kept = [current] + [digest for digest in order if digest != current and digest in versions][:keep - 1]
+        
+        for digest, paths in versions.items():
+            if digest not in kept:
+                for path in paths:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+        
+        manifest[name] = kept
+        
+        def write_manifest(path):
+            with open(path, "w") as f:
+                json.dump(manifest, f)
+        
+        write_atomic(os.path.join(output_dir, VERSIONS_MANIFEST), write_manifest)
+    
+    return published
+
+
+def prune_chart_store(store_dir: str, max_age_days: float) -> int:
+    """
+    Delete stored charts (all derivatives together) that no user folder
+    links to any more and that have not been published for max_age_days.
+    
+    Returns:
+        Number of charts deleted
+    """
+    cutoff = time.time() - max_age_days * 86400
+    charts = {}
+    for filename in os.listdir(store_dir) if os.path.isdir(store_dir) else []:
+        match = CHART_VERSION_RE.match(filename)
+        if match:
+            charts.setdefault(match.group("name", "hash"), []).append(os.path.join(store_dir, filename))
+    
+    removed = 0
+    for (name, digest), files in charts.items():
+        try:
+            stats = [os.stat(path) for path in files]
+        except OSError:
+            continue
+        if all(stat.st_nlink == 1 and stat.st_mtime < cutoff for stat in stats):
+            # Canonical PNG first, so a partly deleted chart is never reused
+            canonical = os.path.join(store_dir, f"{name}.{digest}.png")
+            for path in sorted(files, key=lambda path: path != canonical):
+                try:
+                    os.remove(path)
+                except OSError:
                     pass
+            removed += 1
+    return removed
+
+
+def chart_etag(path: str) -> str:
+    """
+    Strong ETag of a chart file: the version hash and derivative in its
+    name, or a hash of its bytes.
+    """
+    filename = os.path.basename(path)
+    match = CHART_VERSION_RE.match(filename)
+    if match:
+        return f'"{filename[match.start("hash"):]}"'
+    with open(path, 'rb') as f:
+        return '"' + hashlib.sha256(f.read()).hexdigest()[:16] + '"'
+
+# Drawing functions of chart_render, which is imported on first render
+RENDERERS = {
+    "languages": "render_language_chart",
+    "stars": "render_star_timeline",
+    "contributions": "render_contribution_heatmap",
+    "repo_stats": "render_repo_stats_chart",
+}
+
+
+def render_chart(chart: str, *args) -> Optional[str]:
+    """
+    Render one chart with its chart_render function.
+    
+    Args:
+        chart: Chart name (a RENDERERS key)
+        *args: Plain-data arguments and output path of the render function
+    
+    Returns:
+        Path written, or None if there was nothing to draw
+    """
+    import chart_render
+    return getattr(chart_render, RENDERERS[chart])(*args)
+
+
+def chart_jobs(profile_data: Dict) -> Dict[str, Tuple[Callable, tuple]]:
+    """
+    Independent render jobs for a profile's charts.
+    
+    Returns:
+        chart name -> (render function, plain-data arguments; the output
+        path is appended when the job runs)
+    """
+    contribution_summary = profile_data.get("contribution_summary", {})
+    jobs = {}
+    
+    if profile_data.get("top_languages"):
+        jobs["languages"] = (partial(render_chart, "languages"), (profile_data["top_languages"],))
+    
+    if contribution_summary.get("star_timeline"):
+        jobs["stars"] = (partial(render_chart, "stars"), (contribution_summary["star_timeline"],))
+    
+    # Only the data the heatmap reads, so its input key does not change with
+    # fields it ignores: the activity matrix, or else the fields of the top
+    # repositories its fallback estimate uses
+    activity_matrix = contribution_summary.get("activity_matrix")
+    if activity_matrix and any(any(row) for row in activity_matrix):
+        top_repositories = []
+    else:
+        activity_matrix = None
+        top_repositories = [
+            {key: repo.get(key) for key in ("updated_at", "stars", "forks")}
+            for repo in profile_data.get("top_repositories", [])
+        ]
+    jobs["contributions"] = (partial(render_chart, "contributions"), (activity_matrix, top_repositories))
+    
+    return jobs
+
+
+def _warm_worker() -> None:
+    """Pool initializer: import the drawing code and draw a small figure."""
+    import chart_render
+    chart_render.warm()
+
+
+def _ready() -> bool:
+    return True
+
+
+class ChartRenderPool:
+    """
+    Reusable pool of chart rendering processes.
+    
+    Matplotlib holds the GIL while rasterizing, so threads do not render in
+    parallel; worker processes do. Workers are spawned and warmed (imports,
+    fonts, colormaps) by start(), and every chart of every profile is a
+    separate job, so concurrent analyses share all cores.
+    """
+    
+    def __init__(self, workers: int):
+        """
+        Args:
+            workers: Number of worker processes
+        """
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+    
+    def start(self) -> None:
+        """Spawn and warm all worker processes."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker
+                )
+            executor = self._executor
+        # Workers are spawned on demand; submitting one task per worker starts them all
+        for future in [executor.submit(_ready) for _ in range(self.workers)]:
+            future.result()
+    
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(cancel_futures=True)
+    
+    def render(self, jobs: Dict[str, Tuple[Callable, tuple]]) -> Dict[str, Optional[str]]:
+        """
+        Run render jobs in parallel.
+        
+        A pool whose worker died is replaced, and the jobs are rendered
+        in-process for that call.
+        
+        Returns:
+            chart name -> rendered path (None if there was nothing to draw)
+        """
+        with self._lock:
+            executor = self._executor
+        if executor is None:
+            self.start()
+            return self.render(jobs)
+        
+        try:
+            futures = {name: executor.submit(fn, *args) for name, (fn, args) in jobs.items()}
+            return {name: future.result() for name, future in futures.items()}
+        except BrokenProcessPool:
+            print("Warning: chart worker died; restarting the chart pool")
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False)
+            return {name: fn(*args) for name, (fn, args) in jobs.items()}
+    
+    def status(self) -> Dict:
+        """Worker count and whether the pool is running."""
+        return {"workers": self.workers, "running": self._executor is not None}
+
+
+class RenderContext(NamedTuple):
+    """
+    Where one request's charts are published.
+    
+    Contexts are immutable and passed per call, so concurrent requests
+    sharing a ChartGenerator never see each other's folders.
+    """
+    username: str
+    output_dir: str
+
+
+class ChartGenerator:
+    """Generates visualization charts for GitHub profile data."""
+    
+    def __init__(self, output_dir: str = "charts", pool: Optional[ChartRenderPool] = None):
+        """
+        Initialize chart generator with output directory.
+        
+        Args:
+            output_dir: Base chart directory; users' charts are published to
+                its subfolders and rendered charts are stored in its _store
+                folder
+            pool: Render generate_all_charts() jobs in these worker
+                processes instead of the calling thread
+        """
+        self.output_dir = output_dir
+        self.store_dir = os.path.join(output_dir, "_store")
+        self.pool = pool
+        # Input keys being rendered; concurrent requests for one wait for it
+        self._rendering: Dict[str, threading.Event] = {}
+        self._rendering_lock = threading.Lock()
         
-        # If we have sparse data, add some smoothing
-        if data.max() > 0:
-            from scipy.ndimage import gaussian_filter
-            try:
-                data = gaussian_filter(data, sigma=0.8)
-            except:
-                pass  # If scipy not available, use raw data
-        else:
-            # No data available, create a minimal placeholder pattern
-            data = np.ones((7, 24)) * 0.5
-        
-        fig, ax = plt.subplots(figsize=(14, 5))
-        
-        im = ax.imshow(data, cmap='Greens', aspect='auto')
-        
-        # Set ticks
-        hours = list(range(24))
-        ax.set_xticks(np.arange(len(hours)))
-        ax.set_yticks(np.arange(len(days)))
-        ax.set_xticklabels([f'{h:02d}:00' if h % 3 == 0 else '' for h in hours])
-        ax.set_yticklabels(days)
-        
-        # Rotate the tick labels
-        plt.setp(ax.get_xticklabels(), rotation=45, ha="right", rotation_mode="anchor")
-        
-        ax.set_xlabel('Hour of Day', fontsize=12, weight='bold')
-        ax.set_ylabel('Day of Week', fontsize=12, weight='bold')
-        ax.set_title('Repository Activity Pattern', fontsize=16, weight='bold', pad=20)
-        
-        # Add colorbar
-        cbar = plt.colorbar(im, ax=ax)
-        cbar.set_label('Activity Level', rotation=270, labelpad=20, weight='bold')
-        
-        plt.tight_layout()
-        output_path = os.path.join(self.output_dir, filename)
-        plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
-        
-        return output_path
-    
-    def generate_all_charts(self, profile_data: Dict) -> Dict[str, str]:
-        """Generate all charts for a profile."""
-        charts = {}
-        
-        # Language chart
-        if profile_data.get("top_languages"):
-            lang_chart = self.generate_language_chart(profile_data["top_languages"])
-            if lang_chart:
-                charts["languages"] = lang_chart
-        
-        # Star timeline
-        if profile_data.get("contribution_summary", {}).get("star_timeline"):
-            star_chart = self.generate_star_timeline(
-                profile_data["contribution_summary"]["star_timeline"]
-            )
-            if star_chart:
-                charts["stars"] = star_chart
-        
-        # Contribution heatmap
-        contrib_chart = self.generate_contribution_heatmap(profile_data)
-        if contrib_chart:
-            charts["contributions"] = contrib_chart
-        
-        return charts
-    
-    def generate_repo_stats_chart(self, repos: List[Dict], filename: str = "repo_stats.png"):
-        """Generate bar chart comparing repository statistics."""
-        if not repos or len(repos) < 2:
-            return None
-        
-        names = [repo["name"][:20] for repo in repos[:5]]  # Truncate long names
-        stars = [repo["stars"] for repo in repos[:5]]
-        forks = [repo["forks"] for repo in repos[:5]]
-        
-        x = np.arange(len(names))
-        width = 0.35
-        
-        fig, ax = plt.subplots(figsize=(12, 6))
-        
-        bars1 = ax.bar(x - width/2, stars, width, label='Stars', color='#ffd33d')
-        bars2 = ax.bar(x + width/2, forks, width, label='Forks', color='#2188ff')
-        
-        ax.set_xlabel('Repository', fontsize=12, weight='bold')
-        ax.set_ylabel('Count', fontsize=12, weight='bold')
-        ax.set_title('Top Repositories - Stars vs Forks', fontsize=16, weight='bold', pad=20)
-        ax.set_xticks(x)
-        ax.set_xticklabels(names, rotation=45, ha='right')
-        ax.legend()
-        
-        # Add value labels on bars
-        for bars in [bars1, bars2]:
-            for bar in bars:
-                height = bar.get_height()
-                ax.annotate(f'{int(height)}',
-                           xy=(bar.get_x() + bar.get_width() / 2, height),
-                           xytext=(0, 3),
-                           textcoords="offset points",
-                           ha='center', va='bottom', fontsize=9)
-        
-        plt.tight_layout()
-        output_path = os.path.join(self.output_dir, filename)
-        plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
-        
-        return output_path
+        os.makedirs(self.output_dir, exist_ok=True)
+    
+    def context(self, username: str) -> RenderContext:
+        """Rendering context of one user's charts."""
+        return RenderContext(username=username, output_dir=os.path.join(self.output_dir, username))
+    
+    def generate_all_charts(self, profile_data: Dict, context: RenderContext) -> Dict[str, str]:
+        """
+        Generate all charts for a profile and publish them under versioned names.
+        
+        Each chart is keyed by a hash of its input data (chart_input_key).
+        Charts whose key is already in the store are reused without
+        rendering, so unchanged profiles render nothing on refresh and
+        identical charts of different users are rendered and stored once.
+        
+        Safe to call concurrently: all per-request state is in context, and
+        every file is written under a temporary name and renamed into place.
+        
+        Args:
+            profile_data: Analyzed profile
+            context: User to publish for (see context())
+        
+        Returns:
+            chart name -> published path, for charts that had data
+        """
+        os.makedirs(context.output_dir, exist_ok=True)
+        os.makedirs(self.store_dir, exist_ok=True)
+        
+        stored = {}
+        pending = {}
+        targets = {}
+        waiting = {}
+        for name, (fn, args) in chart_jobs(profile_data).items():
+            key = chart_input_key(name, args)
+            path = os.path.join(self.store_dir, f"{name}.{key[:16]}.png")
+            with self._rendering_lock:
+                if os.path.exists(path):
+                    stored[name] = path
+                elif key in self._rendering:
+                    waiting[name] = (self._rendering[key], path)
+                else:
+                    self._rendering[key] = threading.Event()
+                    pending[name] = (fn, args + (path,))
+                    targets[name] = key
+        
+        reused = len(stored) + len(waiting)
+        try:
+            if pending:
+                if self.pool:
+                    rendered = self.pool.render(pending)
+                else:
+                    rendered = {name: fn(*args) for name, (fn, args) in pending.items()}
+                stored.update((name, path) for name, path in rendered.items() if path)
+        finally:
+            with self._rendering_lock:
+                for key in targets.values():
+                    self._rendering.pop(key).set()
+        
+        for name, (event, path) in waiting.items():
+            event.wait()
+            if os.path.exists(path):
+                stored[name] = path
+        print(f"Charts: {reused} reused, {len(pending)} rendered")
+        
+        return {name: publish_chart(path, context.output_dir) for name, path in stored.items()}
+
+
+def chart_pool_from_env() -> Optional[ChartRenderPool]:
+    """
+    Chart render pool as configured by CHART_WORKERS (default: one per CPU,
+    at most 4; 0 renders in the calling thread).
+    """
+    workers = int(os.getenv("CHART_WORKERS", min(4, os.cpu_count() or 1)))
+    return ChartRenderPool(workers) if workers > 0 else None
@@ -0,0 +1,159 @@
+import os
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fetch_context import RepoFetchContext, is_definitive
+from graphql_backend import GraphQLClient
+from rate_budget import STAGE_COST, RequestBudget
+
+
+class CommitCounter:
+    """
+    Counts a user's commits with one of several strategies.
+
+    Strategies, with their cost and accuracy:
+
+    - ``search``: one ``GET /search/commits?q=author:{login} user:{login}``
+      request, O(1). Counts commits the user authored in repositories they
+      own, across every repository. Only default branches are indexed and
+      forks are skipped unless they have more stars than their parent, so
+      the total is near-exact. Uses the search rate limit (30/min).
+    - ``contributor_stats``: one ``GET /repos/{repo}/stats/contributors``
+      per repository, O(repos). Exact commit totals on the default branch,
+      for the repository's top 100 contributors. GitHub answers 202 while
+      it computes the statistics, which is retried with backoff.
+    - ``graphql``: one GraphQL query over the contribution calendar, with
+      one ``contributionsCollection`` alias per year since the account was
+      created, O(1). Counts public commit contributions to any repository,
+      not only the user's own, so it is usually higher.
+    - ``per_repo``: one ``GET /repos/{repo}/commits?author=`` per
+      repository, O(repos). Exact on the default branch. Free with the
+      GraphQL backend, which bulk-loads these counts with the repositories
+      (O(repos/page size) queries).
+    """
+
+    STRATEGIES = ("search", "contributor_stats", "graphql", "per_repo")
+
+    # Strategies that issue one request per repository
+    PER_REPO_STRATEGIES = ("contributor_stats", "per_repo")
+
+    def __init__(self, github, strategy: str, graphql_client: Optional[GraphQLClient] = None):
+        """
+        Initialize the counter.
+
+        Args:
+            github: PyGithub client
+            strategy: One of STRATEGIES
+            graphql_client: Client for the ``graphql`` strategy
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown commit count strategy: {strategy}")
+        if strategy == "graphql" and graphql_client is None:
+            # The GraphQL API does not allow anonymous access
+            print("Warning: graphql commit counting requires a GitHub token, falling back to search")
+            strategy = "search"
+
+        self.github = github
+        self.strategy = strategy
+        self.graphql_client = graphql_client
+
+    @property
+    def is_per_repo(self) -> bool:
+        """Whether the cost of counting grows with the number of repositories."""
+        return self.strategy in self.PER_REPO_STRATEGIES
+
+    @property
+    def snapshot_kind(self) -> str:
+        """Snapshot kind of the per-repository counts of this strategy."""
+        return "commit_count_stats" if self.strategy == "contributor_stats" else "commit_count"
+
+    def count(self, user, repos: List, ctx: RepoFetchContext, budget: RequestBudget) -> int:
+        """
+        Count the user's commits.
+
+        Args:
+            user: User being analyzed
+            repos: The user's repositories
+            ctx: Fetch context of the current analysis
+            budget: Request budget, used by per-repo strategies
+
+        Returns:
+            Total commits
+        """
+        if self.strategy == "search":
+            try:
+                return self._count_search(user)
+            except Exception as e:
+                # Commits were planned as free for search; spend only the calls
+                # no other stage was given (the count is then flagged partial)
+                print(f"Warning: commit search failed ({e}), counting per repository")
+                budget.replan("commits", STAGE_COST["commits"])
+                return self._count_per_repo(user, repos, ctx, budget)
+
+        if self.strategy == "graphql":
+            return self._count_contribution_calendar(user)
+
+        if self.strategy == "contributor_stats":
+            return self._count_contributor_stats(user, repos, ctx, budget)
+
+        return self._count_per_repo(user, repos, ctx, budget)
+
+    def _count_search(self, user) -> int:
+        """Total from the commit search API."""
+        return self.github.search_commits(f"author:{user.login} user:{user.login}").totalCount
+
+    def _count_per_repo(self, user, repos: List, ctx: RepoFetchContext, budget: RequestBudget) -> int:
+        """Sum of per-repository commit counts."""
+        def count(repo) -> Optional[int]:
+            try:
+                return ctx.commit_count(repo, user)
+            except Exception as e:
+                # e.g. an empty repository; transient errors are not recorded
+                return 0 if is_definitive(e) else None
+
+        return sum(filter(None, ctx.map_derived("commit_count", count, budget.select("commits", repos))))
+
+    def _count_contributor_stats(self, user, repos: List, ctx: RepoFetchContext, budget: RequestBudget) -> int:
+        """Sum of the user's totals in each repository's contributor statistics."""
+        def count(repo) -> Optional[int]:
+            try:
+                for contributor in ctx.contributor_stats(repo):
+                    if contributor.author and contributor.author.login == user.login:
+                        return contributor.total
+            except Exception as e:
+                # Statistics still being computed are not recorded either
+                return 0 if is_definitive(e) else None
+            return 0
+
+        return sum(filter(None, ctx.map_derived("commit_count_stats", count, budget.select("commits", repos))))
+
+    def _count_contribution_calendar(self, user) -> int:
+        """Sum of yearly commit contributions since the account was created."""
+        now = datetime.now(timezone.utc)
+        first_year = user.created_at.year if user.created_at else now.year
+
+        # contributionsCollection spans at most one year, so alias one per year
+        fields = []
+        for year in range(first_year, now.year + 1):
+            start = datetime(year, 1, 1, tzinfo=timezone.utc)
+            end = min(datetime(year, 12, 31, 23, 59, 59, tzinfo=timezone.utc), now)
+            fields.append(
+                f'y{year}: contributionsCollection(from: "{start.isoformat()}", to: "{end.isoformat()}") '
+                '{ totalCommitContributions }'
+            )
+
+        query = "query($login: String!) { user(login: $login) { " + " ".join(fields) + " } }"
+        data = self.graphql_client.query(query, {"login": user.login})
+        return sum(year["totalCommitContributions"] for year in data["user"].values())
+
+
+def strategy_from_env(graphql_backend: bool) -> str:
+    """
+    Commit count strategy from COMMIT_COUNT_STRATEGY.
+
+    Defaults to ``per_repo`` with the GraphQL backend, where the counts are
+    already bulk-loaded, and to ``search`` otherwise.
+    """
+    default = "per_repo" if graphql_backend else "search"
+    # An empty value (as copied from .env.example) also means the default
+    return (os.getenv("COMMIT_COUNT_STRATEGY") or default).lower()
@@ -0,0 +1,249 @@
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from github import GithubException, RateLimitExceededException
+
+
+def fetch_stats(loader: Callable[[], Any], attempts: int = 4, delay: float = 1.0) -> Any:
+    """
+    Load a /stats/* resource. GitHub answers 202 (PyGithub returns None)
+    while it computes the statistics, so retry with exponential backoff.
+
+    Returns:
+        The statistics, or None if they are still not ready
+    """
+    for attempt in range(attempts):
+        result = loader()
+        if result is not None:
+            return result
+        if attempt < attempts - 1:
+            time.sleep(delay * (2 ** attempt))
+    return None
+
+
+def is_definitive(error: Exception) -> bool:
+    """
+    Whether a failed fetch is a lasting answer about the repository, so
+    empty or fallback data derived from it may be recorded in snapshots.
+
+    Not found (404), empty repository (409), unavailable for legal
+    reasons (451) and no permission (403, e.g. collaborators without push
+    access) are definitive. Rate limits, 5xx responses, network errors and
+    statistics that are still being computed are not.
+    """
+    if isinstance(error, RateLimitExceededException):
+        return False
+    return isinstance(error, GithubException) and error.status in (403, 404, 409, 451)
+
+
+def punch_card_matrix(rows: Iterable) -> List[List[int]]:
+    """
+    Convert /stats/punch_card rows into a 7x24 matrix of commit counts.
+
+    Args:
+        rows: [day, hour, commits] rows, where day 0 is Sunday
+
+    Returns:
+        Rows per weekday (Monday first) of 24 hourly counts
+    """
+    matrix = [[0] * 24 for _ in range(7)]
+    for day, hour, commits in rows:
+        matrix[(day - 1) % 7][hour] += commits
+    return matrix
+
+
+class FetchMemo:
+    """
+    Thread-safe memo of fetched resources.
+
+    Each key is loaded at most once; concurrent readers of a key wait for
+    its single load. Failed loads are remembered and re-raised.
+    """
+
+    def __init__(self):
+        """Initialize an empty memo."""
+        self._values: Dict[Tuple, Tuple[bool, Any]] = {}
+        self._key_locks: Dict[Tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def put(self, key: Tuple, value: Any) -> None:
+        """Store an already known value."""
+        self._values[key] = (True, value)
+
+    def fetch(self, key: Tuple, loader: Callable[[], Any]) -> Any:
+        """Return the memoized result for key, loading it on first use."""
+        if key not in self._values:
+            with self._lock:
+                key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+            with key_lock:
+                # Another thread may have loaded it while we waited
+                if key not in self._values:
+                    try:
+                        self._values[key] = (True, loader())
+                    except Exception as e:
+                        self._values[key] = (False, e)
+
+        ok, value = self._values[key]
+        if not ok:
+            raise value
+        return value
+
+
+class RepoFetchContext:
+    """
+    Per-analysis memo of repository sub-resources.
+
+    Every analyzer stage reads collaborators, contributors, pulls, issues,
+    reviews, languages and topics through this context, so each resource
+    is requested from GitHub at most once per `analyze_profile` run.
+    Failed fetches are remembered too, so a 403 on collaborators is not
+    retried by the next stage.
+
+    Bulk backends (see graphql_backend.py) can `prime` the memo up front,
+    in which case stages never hit the REST API for those resources.
+
+    Stages fan out per-repo work with `map`, which runs on the analyzer's
+    bounded thread pool. Concurrent requests for the same resource share
+    a single fetch.
+
+    With a RepoSnapshot attached, `map_derived` reuses per-repo results of
+    the previous analysis for repositories that have not changed.
+    """
+
+    # Largest slices any stage reads; fetched once and sliced afterwards
+    PULLS_LIMIT = 20
+    ISSUES_LIMIT = 10
+    REVIEWS_LIMIT = 5
+
+    def __init__(self, executor: Optional[Executor] = None):
+        """
+        Initialize an empty memo.
+
+        Args:
+            executor: Pool used by `map`; per-repo work runs serially without one
+        """
+        self.executor = executor
+        self.snapshot = None
+        self._memo = FetchMemo()
+        self._lock = threading.Lock()
+        self.requests_made = 0
+
+    def map(self, fn: Callable[[Any], Any], items: Iterable) -> List:
+        """Apply fn to every item concurrently, returning results in input order."""
+        items = list(items)
+        if self.executor is None or len(items) < 2:
+            return [fn(item) for item in items]
+        return list(self.executor.map(fn, items))
+
+    def map_derived(self, kind: str, fn: Callable[[Any], Any], repos: Iterable) -> List:
+        """
+        Like `map` over repositories, but results are JSON-serializable
+        per-repo data that is read from / recorded in the snapshot.
+
+        fn returns None when the data could not be derived (e.g. on a rate
+        limit or server error); None is not recorded, so the repository is
+        fetched again by the next analysis.
+        """
+        def derive(repo):
+            if self.snapshot is not None:
+                value = self.snapshot.get(kind, repo)
+                if value is not None:
+                    return value
+            value = fn(repo)
+            if self.snapshot is not None and value is not None:
+                self.snapshot.put(kind, repo, value)
+            return value
+
+        return self.map(derive, repos)
+
+    def _fetch(self, key: Tuple, loader: Callable[[], Any]) -> Any:
+        """Return the memoized result for key, loading it on first use."""
+        def load():
+            with self._lock:
+                self.requests_made += 1
+            return loader()
+
+        return self._memo.fetch(key, load)
+
+    def prime(self, kind: str, repo, value: Any, *extra) -> None:
+        """Store an already known resource so it is never fetched."""
+        self._memo.put((kind, repo.full_name) + extra, value)
+
+    def collaborators(self, repo) -> List:
+        """Users with push access to the repository."""
+        return self._fetch(
+            ("collaborators", repo.full_name),
+            lambda: list(repo.get_collaborators())
+        )
+
+    def contributors(self, repo) -> List:
+        """Commit authors of the repository."""
+        return self._fetch(
+            ("contributors", repo.full_name),
+            lambda: list(repo.get_contributors())
+        )
+
+    def pulls(self, repo) -> List:
+        """Most recent pull requests (any state), up to PULLS_LIMIT."""
+        return self._fetch(
+            ("pulls", repo.full_name),
+            lambda: list(repo.get_pulls(state='all')[:self.PULLS_LIMIT])
+        )
+
+    def issues(self, repo) -> List:
+        """Most recent issues (any state), up to ISSUES_LIMIT."""
+        return self._fetch(
+            ("issues", repo.full_name),
+            lambda: list(repo.get_issues(state='all')[:self.ISSUES_LIMIT])
+        )
+
+    def reviews(self, repo, pull) -> List:
+        """First reviews of a pull request, up to REVIEWS_LIMIT."""
+        return self._fetch(
+            ("reviews", repo.full_name, pull.number),
+            lambda: list(pull.get_reviews()[:self.REVIEWS_LIMIT])
+        )
+
+    def languages(self, repo) -> Dict[str, int]:
+        """Language name -> bytes of code."""
+        return self._fetch(
+            ("languages", repo.full_name),
+            lambda: repo.get_languages()
+        )
+
+    def topics(self, repo) -> List[str]:
+        """Repository topics."""
+        return self._fetch(
+            ("topics", repo.full_name),
+            lambda: repo.get_topics()
+        )
+
+    def commit_count(self, repo, user) -> int:
+        """Number of commits authored by user on the default branch."""
+        return self._fetch(
+            ("commit_count", repo.full_name),
+            lambda: repo.get_commits(author=user.login).totalCount
+        )
+
+    def punch_card(self, repo) -> List[List[int]]:
+        """Commits per weekday (Monday first) and hour, from /stats/punch_card."""
+        def load() -> List[List[int]]:
+            stats = fetch_stats(repo.get_stats_punch_card)
+            if stats is None:
+                raise RuntimeError(f"Punch card of {repo.full_name} is not ready")
+            return punch_card_matrix(stats.raw_data)
+
+        return self._fetch(("punch_card", repo.full_name), load)
+
+    def contributor_stats(self, repo) -> List:
+        """Per-contributor commit totals from /stats/contributors (top 100 contributors)."""
+        def load() -> List:
+            stats = fetch_stats(repo.get_stats_contributors)
+            if stats is None:
+                raise RuntimeError(f"Contributor statistics of {repo.full_name} are not ready")
+            return stats
+
+        return self._fetch(("contributor_stats", repo.full_name), load)
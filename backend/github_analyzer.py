@@ -1,21 +1,118 @@
 import os
+import calendar
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from github import Github, GithubException
 from collections import Counter
+import numpy as np
 import requests
 
+import github_transport
+from commit_counter import CommitCounter, strategy_from_env
+from fetch_context import RepoFetchContext, is_definitive
+from graphql_backend import GraphQLBackend, GraphQLClient
+from http_cache import ConditionalCacheAdapter, HTTPCacheStore
+from person_directory import directory_from_env
+from rate_budget import STAGE_COST, RequestBudget, plan_budget
+from snapshots import RepoSnapshotStore
+from token_pool import TokenPool, TokenPoolAdapter, pool_from_env
+
 
 class GitHubAnalyzer:
     """Analyzes GitHub profiles and repositories."""
     
-    def __init__(self, github_token: Optional[str] = None):
-        """Initialize the analyzer with optional GitHub token."""
+    def __init__(self, github_token: Optional[str] = None, backend: Optional[str] = None):
+        """
+        Initialize the analyzer with optional GitHub token.
+        
+        Args:
+            github_token: GitHub token, defaults to GITHUB_TOKEN
+            backend: Data backend, "rest" or "graphql" (defaults to GITHUB_BACKEND or "rest")
+        """
         self.token = github_token or os.getenv("GITHUB_TOKEN")
+        
+        # Extra tokens / GitHub App installations share the load per request
+        self.token_pool: Optional[TokenPool] = pool_from_env(self.token)
+        if self.token_pool and not self.token:
+            self.token = self.token_pool.tokens[0].token
+        
+        # Per-repo requests fan out over a bounded pool; the pool size replaces
+        # PyGithub's default 0.25s spacing between requests as the throttle
+        self.max_concurrency = int(os.getenv("GITHUB_MAX_CONCURRENCY", 8))
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="github-fetch"
+        ) if self.max_concurrency > 1 else None
+        
+        # Must be installed before the client is created
+        self.http_cache = self._install_transport()
+        
+        github_options = {
+            # REST endpoint, e.g. a local stub server (see benchmarks/stub_graphql.py)
+            "base_url": os.getenv("GITHUB_API_URL") or "https://api.github.com",
+            "pool_size": max(self.max_concurrency, 1),
+            "seconds_between_requests": None,
+            # Fewer pages for commit, contributor and collaborator lists
+            "per_page": 100
+        }
         if self.token:
-            self.github = Github(self.token)
+            self.github = Github(self.token, **github_options)
         else:
-            self.github = Github()  # Anonymous access (lower rate limits)
+            self.github = Github(**github_options)  # Anonymous access (lower rate limits)
+        
+        self.backend = (backend or os.getenv("GITHUB_BACKEND", "rest")).lower()
+        if self.backend not in ("rest", "graphql"):
+            raise ValueError(f"Unknown GitHub backend: {self.backend}")
+        if self.backend == "graphql" and not self.token:
+            # The GraphQL API does not allow anonymous access
+            print("Warning: GraphQL backend requires a GitHub token, falling back to REST")
+            self.backend = "rest"
+        
+        # Per-repo results of previous analyses, for incremental refreshes
+        snapshot_dir = os.getenv("GITHUB_SNAPSHOT_DIR", "data/snapshots")
+        self.snapshots = None if snapshot_dir.lower() in ("", "off", "none") else RepoSnapshotStore(
+            snapshot_dir, int(os.getenv("GITHUB_SNAPSHOT_MAX_AGE_DAYS", 7))
+        )
+        
+        self.graphql = GraphQLBackend(
+            self.github, self.token, session=github_transport.session()
+        ) if self.backend == "graphql" else None
+        
+        graphql_client = self.graphql.client if self.graphql else (
+            GraphQLClient(self.token, session=github_transport.session()) if self.token else None
+        )
+        self.commit_counter = CommitCounter(
+            self.github, strategy_from_env(self.graphql is not None), graphql_client
+        )
+        
+        # Display names of collaborators/contributors, shared across analyses
+        self.person_directory = directory_from_env(graphql_client)
+    
+    def _install_transport(self) -> Optional[HTTPCacheStore]:
+        """
+        Route GitHub calls through the token pool and the persistent
+        conditional-request cache, whichever are configured.
+        
+        Returns:
+            The HTTP cache store, if enabled
+        """
+        path = os.getenv("GITHUB_HTTP_CACHE", "data/http_cache.sqlite3")
+        store = None if path.lower() in ("", "off", "none") else HTTPCacheStore(path)
+        pool = self.token_pool
+        if not store and not pool:
+            return None
+        
+        def wrap(adapter):
+            # Cache outermost so revalidated responses are keyed before token routing
+            if pool:
+                adapter = TokenPoolAdapter(adapter, pool)
+            if store:
+                adapter = ConditionalCacheAdapter(adapter, store)
+            return adapter
+        
+        github_transport.install(wrap)
+        return store
     
     def analyze_profile(self, username: str) -> Dict:
         """
@@ -27,72 +124,190 @@ class GitHubAnalyzer:
         Returns:
             Dictionary containing all profile analysis data
         """
-        try:
-            user = self.github.get_user(username)
-            
-            # Fetch repositories
-            repos = list(user.get_repos())
-            
-            # Calculate statistics
-            stats = self._calculate_stats(user, repos)
+        profile_data = {}
+        for _, section_data in self.analyze_profile_iter(username):
+            profile_data.update(section_data)
+        return profile_data
+    
+    def analyze_profile_iter(self, username: str) -> Iterator[Tuple[str, Dict]]:
+        """
+        Analyze a GitHub profile section by section.
+        
+        The profile basics are yielded right after the user is fetched, then
+        every stage of the pipeline is yielded as soon as it has finished.
+        
+        Args:
+            username: GitHub username to analyze
             
-            # Get top languages
-            top_languages = self._get_top_languages(repos)
+        Yields:
+            (section name, profile_data keys produced by the section)
+        """
+        try:
+            # Shared memo so each per-repo resource is fetched once per run
+            ctx = RepoFetchContext(self.executor)
             
-            # Get top repositories
-            top_repos = self._get_top_repositories(repos)
+            # Fetch the user first so the basics are available immediately
+            user = self._load_user(username)
+            if self.person_directory:
+                # Analyzed users are often each other's collaborators
+                self.person_directory.put(user.login, user.name or user.login)
+            yield "profile", self._get_profile_basics(username, user)
             
-            # Get contribution summary
-            contribution_summary = self._get_contribution_summary(user, repos)
+            # Fetch repositories
+            repos = self._load_repos(user, ctx)
             
-            # Calculate collaboration score
-            collaboration_score = self._calculate_collaboration_score(user, repos)
+            # Reuse per-repo results of the previous analysis for unchanged repos
+            if self.snapshots:
+                ctx.snapshot = self.snapshots.load(username, repos)
             
-            # Get collaborators from repositories
-            collaborators = self._get_collaborators(user, repos)
+            # Split the remaining rate limit between the per-repo stages
+            budget = self._plan_budget(user, repos, ctx)
             
-            # Generate AI summary
-            ai_summary = self._generate_ai_summary(user, repos, top_languages)
+            profile_data = {}
+            for section, produce in self._pipeline():
+                section_data = produce(user, repos, ctx, budget, profile_data)
+                profile_data.update(section_data)
+                yield section, section_data
             
-            # Build profile data
-            profile_data = {
-                "username": username,
-                "name": user.name or username,
-                "bio": user.bio or "",
-                "avatar_url": user.avatar_url,
-                "blog": user.blog or "",
-                "location": user.location or "",
-                "email": user.email or "",
-                "twitter_username": user.twitter_username or "",
-                "company": user.company or "",
-                "hireable": user.hireable or False,
-                "created_at": user.created_at.isoformat() if user.created_at else "",
-                "updated_at": user.updated_at.isoformat() if user.updated_at else "",
-                "stats": stats,
-                "top_languages": top_languages,
-                "top_repositories": top_repos,
-                "contribution_summary": contribution_summary,
-                "collaboration_score": collaboration_score,
-                "collaborators": collaborators,
-                "ai_summary": ai_summary,
+            yield "analysis", {
+                "analysis_coverage": self._get_coverage(repos, ctx, budget),
                 "analyzed_at": datetime.now(timezone.utc).isoformat()
             }
             
-            return profile_data
+            if self.snapshots:
+                self.snapshots.save(username, ctx.snapshot)
             
         except GithubException as e:
             raise Exception(f"GitHub API error: {str(e)}")
         except Exception as e:
             raise Exception(f"Analysis error: {str(e)}")
     
-    def _calculate_stats(self, user, repos: List) -> Dict:
+    def _pipeline(self) -> List[Tuple[str, Callable]]:
+        """
+        Ordered analysis stages.
+        
+        Each producer takes (user, repos, ctx, budget, profile_data so far)
+        and returns the profile_data keys of its section.
+        """
+        return [
+            # Calculate statistics
+            ("stats", lambda user, repos, ctx, budget, profile: {
+                "stats": self._calculate_stats(user, repos, ctx, budget)
+            }),
+            # Get top languages
+            ("top_languages", lambda user, repos, ctx, budget, profile: {
+                "top_languages": self._get_top_languages(repos, ctx, budget)
+            }),
+            # Generate AI summary
+            ("ai_summary", lambda user, repos, ctx, budget, profile: {
+                "ai_summary": self._generate_ai_summary(user, repos, profile["top_languages"])
+            }),
+            # Get top repositories
+            ("top_repositories", lambda user, repos, ctx, budget, profile: {
+                "top_repositories": self._get_top_repositories(repos, ctx)
+            }),
+            # Get contribution summary
+            ("contribution_summary", lambda user, repos, ctx, budget, profile: {
+                "contribution_summary": self._get_contribution_summary(user, repos, ctx, budget)
+            }),
+            # Calculate collaboration score
+            ("collaboration_score", lambda user, repos, ctx, budget, profile: {
+                "collaboration_score": self._calculate_collaboration_score(user, repos, ctx, budget)
+            }),
+            # Get collaborators from repositories
+            ("collaborators", lambda user, repos, ctx, budget, profile: {
+                "collaborators": self._get_collaborators(user, repos, ctx, budget)
+            }),
+        ]
+    
+    def _get_profile_basics(self, username: str, user) -> Dict:
+        """Profile fields read from the user object alone."""
+        return {
+            "username": username,
+            "name": user.name or username,
+            "bio": user.bio or "",
+            "avatar_url": user.avatar_url,
+            "blog": user.blog or "",
+            "location": user.location or "",
+            "email": user.email or "",
+            "twitter_username": user.twitter_username or "",
+            "company": user.company or "",
+            "hireable": user.hireable or False,
+            "created_at": user.created_at.isoformat() if user.created_at else "",
+            "updated_at": user.updated_at.isoformat() if user.updated_at else ""
+        }
+    
+    def _load_user(self, username: str):
+        """Fetch the user from the configured backend."""
+        if self.graphql:
+            return self.graphql.load_user(username)
+        return self.github.get_user(username)
+    
+    def _load_repos(self, user, ctx: RepoFetchContext) -> List:
+        """Fetch the user's repositories from the configured backend."""
+        if self.graphql:
+            return self.graphql.load_repos(user, ctx)
+        return list(user.get_repos())
+    
+    def _plan_budget(self, user, repos: List, ctx: RepoFetchContext) -> RequestBudget:
+        """Plan how many repositories each stage can afford to analyze."""
+        costs = dict(STAGE_COST)
+        if self.graphql:
+            # Bulk-loaded up front; only collaborators and contributors remain per repo
+            costs.update(languages=0, commits=0, activity=0, collaboration=2)
+        if not self.commit_counter.is_per_repo:
+            # Counted with a single request
+            costs["commits"] = 0
+        
+        # A stage costs nothing for unchanged repositories whose data for
+        # that stage is in the last snapshot (sampled-out ones have none)
+        is_free = None
+        if ctx.snapshot:
+            snapshot_kinds = {
+                "languages": "languages",
+                "commits": self.commit_counter.snapshot_kind,
+                "collaborators": "people",
+                "collaboration": "collaboration",
+                "activity": "punch_card"
+            }
+            is_free = lambda stage, repo: ctx.snapshot.has(snapshot_kinds[stage], repo)
+        
+        def paid(stage: str, stage_repos: List) -> int:
+            return len([repo for repo in stage_repos if not (is_free and is_free(stage, repo))])
+        
+        owned_repos = [repo for repo in repos if not repo.fork and repo.owner.login == user.login]
+        demands = {
+            "languages": (paid("languages", [repo for repo in repos if repo.language]), costs["languages"]),
+            "commits": (paid("commits", repos), costs["commits"]),
+            "collaborators": (paid("collaborators", owned_repos), costs["collaborators"]),
+            "collaboration": (paid("collaboration", repos), costs["collaboration"]),
+            "activity": (paid("activity", repos), costs["activity"])
+        }
+        
+        # Read from the last response's X-RateLimit-* headers (/rate_limit if none yet)
+        remaining, _ = self.github.rate_limiting
+        reset_at = datetime.fromtimestamp(self.github.rate_limiting_resettime, timezone.utc)
+        if self.token_pool:
+            remaining = self.token_pool.total_remaining("core")
+        return plan_budget(remaining, demands, reset_at, is_free=is_free)
+    
+    def _get_coverage(self, repos: List, ctx: RepoFetchContext, budget: RequestBudget) -> Dict:
+        """Describe what the analysis covered, including snapshot reuse."""
+        coverage = budget.coverage()
+        reused = len(ctx.snapshot.reused) if ctx.snapshot else 0
+        coverage["repos_reused"] = reused
+        coverage["repos_refreshed"] = len(repos) - reused
+        coverage["commit_count_strategy"] = self.commit_counter.strategy
+        return coverage
+    
+    def _calculate_stats(self, user, repos: List, ctx: RepoFetchContext, budget: RequestBudget) -> Dict:
         """Calculate comprehensive statistics."""
         total_stars = sum(repo.stargazers_count for repo in repos)
         total_forks = sum(repo.forks_count for repo in repos)
         total_watchers = sum(repo.watchers_count for repo in repos)
         
-        # Calculate total commits (approximate from recent activity)
-        total_commits = self._estimate_total_commits(user, repos)
+        # Calculate total commits
+        total_commits = self._estimate_total_commits(user, repos, ctx, budget)
         
         return {
             "total_repos": user.public_repos,
@@ -105,32 +320,32 @@ class GitHubAnalyzer:
             "following": user.following
         }
     
-    def _estimate_total_commits(self, user, repos: List) -> int:
-        """Estimate total commits across all repositories."""
-        total = 0
-        # Limit to prevent rate limiting
-        for repo in repos[:20]:
-            try:
-                commits = repo.get_commits(author=user)
-                total += commits.totalCount
-            except:
-                continue
-        return total
+    def _estimate_total_commits(self, user, repos: List, ctx: RepoFetchContext, budget: RequestBudget) -> int:
+        """Count total commits with the configured strategy (see CommitCounter)."""
+        try:
+            return self.commit_counter.count(user, repos, ctx, budget)
+        except Exception as e:
+            print(f"Warning: could not count commits: {e}")
+            return 0
     
-    def _get_top_languages(self, repos: List, top_n: int = 5) -> List[Dict]:
+    def _get_top_languages(self, repos: List, ctx: RepoFetchContext, budget: RequestBudget, top_n: int = 5) -> List[Dict]:
         """Get top programming languages used."""
         language_bytes = Counter()
         
-        for repo in repos:
-            if repo.language:
-                # Get languages breakdown
-                try:
-                    languages = repo.get_languages()
-                    for lang, bytes_count in languages.items():
-                        language_bytes[lang] += bytes_count
-                except:
-                    # Fallback to primary language
-                    language_bytes[repo.language] += 1000
+        def fetch(repo) -> Optional[Dict[str, int]]:
+            # Get languages breakdown
+            try:
+                return ctx.languages(repo)
+            except Exception as e:
+                # Fallback to primary language (not recorded after transient errors)
+                return {repo.language: 1000} if is_definitive(e) else None
+        
+        repos_with_language = budget.select("languages", [repo for repo in repos if repo.language])
+        for repo, languages in zip(repos_with_language, ctx.map_derived("languages", fetch, repos_with_language)):
+            if languages is None:
+                languages = {repo.language: 1000}
+            for lang, bytes_count in languages.items():
+                language_bytes[lang] += bytes_count
         
         # Calculate percentages
         total_bytes = sum(language_bytes.values())
@@ -146,13 +361,15 @@ class GitHubAnalyzer:
         
         return top_languages
     
-    def _get_top_repositories(self, repos: List, top_n: int = 5) -> List[Dict]:
+    def _get_top_repositories(self, repos: List, ctx: RepoFetchContext, top_n: int = 5) -> List[Dict]:
         """Get top repositories by stars."""
         # Sort by stars
         sorted_repos = sorted(repos, key=lambda r: r.stargazers_count, reverse=True)[:top_n]
         
+        topics = ctx.map_derived("topics", lambda repo: self._get_topics(repo, ctx), sorted_repos)
+        
         top_repos = []
-        for repo in sorted_repos:
+        for repo, repo_topics in zip(sorted_repos, topics):
             top_repos.append({
                 "name": repo.name,
                 "full_name": repo.full_name,
@@ -166,12 +383,19 @@ class GitHubAnalyzer:
                 "open_issues": repo.open_issues_count,
                 "created_at": repo.created_at.isoformat() if repo.created_at else "",
                 "updated_at": repo.updated_at.isoformat() if repo.updated_at else "",
-                "topics": repo.get_topics() if hasattr(repo, 'get_topics') else []
+                "topics": repo_topics or []
             })
         
         return top_repos
     
-    def _get_contribution_summary(self, user, repos: List) -> Dict:
+    def _get_topics(self, repo, ctx: RepoFetchContext) -> Optional[List[str]]:
+        """Get repository topics, an empty list if unavailable, or None after a transient error."""
+        try:
+            return ctx.topics(repo)
+        except Exception as e:
+            return [] if is_definitive(e) else None
+    
+    def _get_contribution_summary(self, user, repos: List, ctx: RepoFetchContext, budget: RequestBudget) -> Dict:
         """Get contribution activity summary."""
         now = datetime.now(timezone.utc)
         last_month = now - timedelta(days=30)
@@ -183,11 +407,15 @@ class GitHubAnalyzer:
         # Get commit activity for star growth
         star_timeline = self._get_star_timeline(repos)
         
+        # Weekday x hour commit counts across repositories
+        activity_matrix = self._get_activity_matrix(repos, ctx, budget)
+        
         return {
             "repos_updated_last_month": len(recent_repos),
             "repos_updated_last_year": len(active_year_repos),
             "star_timeline": star_timeline,
-            "most_active_day": self._get_most_active_day(repos),
+            "most_active_day": self._get_most_active_day(activity_matrix),
+            "activity_matrix": activity_matrix.tolist(),
             "contribution_streak": self._estimate_streak(repos)
         }
     
@@ -231,22 +459,32 @@ class GitHubAnalyzer:
         
         return timeline
     
-    def _get_most_active_day(self, repos: List) -> str:
-        """Determine most active day of the week."""
-        day_counter = Counter()
+    def _get_activity_matrix(self, repos: List, ctx: RepoFetchContext, budget: RequestBudget) -> np.ndarray:
+        """
+        Merge the repositories' punch cards into one matrix.
         
-        for repo in repos[:50]:  # Limit to prevent rate limiting
+        Returns:
+            7x24 array of commit counts, rows Monday to Sunday, columns by hour
+        """
+        matrix = np.zeros((7, 24), dtype=np.int64)
+        
+        def fetch(repo) -> List[List[int]]:
             try:
-                commits = list(repo.get_commits()[:100])
-                for commit in commits:
-                    if commit.commit.author.date:
-                        day = commit.commit.author.date.strftime("%A")
-                        day_counter[day] += 1
+                return ctx.punch_card(repo)
             except:
-                continue
+                return None
         
-        if day_counter:
-            return day_counter.most_common(1)[0][0]
+        for punch_card in ctx.map_derived("punch_card", fetch, budget.select("activity", repos)):
+            if punch_card:
+                matrix += np.asarray(punch_card, dtype=np.int64)
+        
+        return matrix
+    
+    def _get_most_active_day(self, activity_matrix: np.ndarray) -> str:
+        """Determine most active day of the week."""
+        day_totals = activity_matrix.sum(axis=1)
+        if day_totals.any():
+            return calendar.day_name[int(day_totals.argmax())]
         return "Unknown"
     
     def _estimate_streak(self, repos: List) -> int:
@@ -311,7 +549,7 @@ class GitHubAnalyzer:
         
         return summary
     
-    def _get_collaborators(self, user, repos: List) -> Dict:
+    def _get_collaborators(self, user, repos: List, ctx: RepoFetchContext, budget: RequestBudget) -> Dict:
         """
         Get collaborators and contributors from user's repositories.
         
@@ -333,84 +571,61 @@ class GitHubAnalyzer:
         all_people = {}  # username -> {name, avatar_url, repo_count, type}
         
         # Only check repos where user is the owner (not forks)
-        owned_repos = [repo for repo in repos if not repo.fork and repo.owner.login == user.login][:15]
+        owned_repos = budget.select(
+            "collaborators",
+            [repo for repo in repos if not repo.fork and repo.owner.login == user.login]
+        )
         
-        for repo in owned_repos:
-            repo_collaborators = []
-            repo_contributors = []
-            
-            # Try to get collaborators (requires push access)
-            try:
-                collaborators_list = list(repo.get_collaborators())
-                
-                # Filter out the owner themselves
-                repo_collaborators = [
-                    {
-                        "username": collab.login,
-                        "name": collab.name or collab.login,
-                        "avatar_url": collab.avatar_url,
+        people_by_repo = [
+            people or ([], [])
+            for people in ctx.map_derived("people", lambda repo: self._get_repo_people(user, repo, ctx), owned_repos)
+        ]
+        
+        # Resolve display names of everyone at once
+        names = self._resolve_names([
+            person
+            for repo_collaborators, repo_contributors in people_by_repo
+            for person in repo_collaborators + repo_contributors
+        ])
+        people_by_repo = [
+            (
+                [self._with_name(person, names) for person in repo_collaborators],
+                [self._with_name(person, names) for person in repo_contributors]
+            )
+            for repo_collaborators, repo_contributors in people_by_repo
+        ]
+        
+        for repo, (repo_collaborators, repo_contributors) in zip(owned_repos, people_by_repo):
+            # Track collaborators
+            for collab in repo_collaborators:
+                username = collab["username"]
+                if username not in all_people:
+                    all_people[username] = {
+                        "username": username,
+                        "name": collab["name"],
+                        "avatar_url": collab["avatar_url"],
+                        "repo_count": 0,
                         "type": "collaborator"
                     }
-                    for collab in collaborators_list 
-                    if collab.login != user.login
-                ]
-                
-                # Track collaborators
-                for collab in repo_collaborators:
-                    username = collab["username"]
-                    if username not in all_people:
-                        all_people[username] = {
-                            "username": username,
-                            "name": collab["name"],
-                            "avatar_url": collab["avatar_url"],
-                            "repo_count": 0,
-                            "type": "collaborator"
-                        }
-                    all_people[username]["repo_count"] += 1
-                        
-            except:
-                # Permission denied or other API errors - skip collaborators
-                pass
+                all_people[username]["repo_count"] += 1
             
-            # Get contributors (commit authors) - this works for all public repos
-            try:
-                contributors_list = list(repo.get_contributors())
-                
-                # Filter out the owner and already tracked collaborators
-                collab_usernames = {c["username"] for c in repo_collaborators}
-                repo_contributors = [
-                    {
-                        "username": contrib.login,
-                        "name": contrib.name or contrib.login,
-                        "avatar_url": contrib.avatar_url,
-                        "contributions": contrib.contributions,
-                        "type": "contributor"
+            # Track contributors
+            for contrib in repo_contributors:
+                username = contrib["username"]
+                if username not in all_people:
+                    all_people[username] = {
+                        "username": username,
+                        "name": contrib["name"],
+                        "avatar_url": contrib["avatar_url"],
+                        "repo_count": 0,
+                        "type": "contributor",
+                        "total_contributions": 0
                     }
-                    for contrib in contributors_list 
-                    if contrib.login != user.login and contrib.login not in collab_usernames
-                ]
-                
-                # Track contributors
-                for contrib in repo_contributors:
-                    username = contrib["username"]
-                    if username not in all_people:
-                        all_people[username] = {
-                            "username": username,
-                            "name": contrib["name"],
-                            "avatar_url": contrib["avatar_url"],
-                            "repo_count": 0,
-                            "type": "contributor",
-                            "total_contributions": 0
-                        }
-                    all_people[username]["repo_count"] += 1
-                    if "total_contributions" in all_people[username]:
-                        all_people[username]["total_contributions"] += contrib["contributions"]
-                    else:
-                        all_people[username]["total_contributions"] = contrib["contributions"]
-                        
-            except:
-                # API errors - skip contributors for this repo
-                pass
+                all_people[username]["repo_count"] += 1
+                if "total_contributions" in all_people[username]:
+                    all_people[username]["total_contributions"] += contrib["contributions"]
+                else:
+                    all_people[username]["total_contributions"] = contrib["contributions"]
             
             # Add repo data if it has any collaborators or contributors
             if repo_collaborators or repo_contributors:
@@ -438,7 +653,150 @@ class GitHubAnalyzer:
         
         return collaborators_data
     
-    def _calculate_collaboration_score(self, user, repos: List) -> Dict:
+    def _resolve_names(self, people: List[Dict]) -> Dict[str, str]:
+        """Display names of people (login when names are not resolved)."""
+        node_ids = {person["username"]: person.get("node_id") for person in people}
+        if not self.person_directory:
+            return {login: login for login in node_ids}
+        return self.person_directory.resolve(node_ids)
+    
+    def _with_name(self, person: Dict, names: Dict[str, str]) -> Dict:
+        """Person as listed in the profile: named, without the node ID."""
+        named = {"username": person["username"], "name": names.get(person["username"], person["username"])}
+        named.update((key, value) for key, value in person.items() if key not in ("username", "node_id"))
+        return named
+    
+    def _get_repo_people(self, user, repo, ctx: RepoFetchContext):
+        """
+        Get (collaborators, contributors) of a single repository, excluding the owner.
+        
+        Only attributes included in the listings are read: `name` would
+        fetch every user individually, so names are resolved afterwards.
+        
+        Returns:
+            (collaborators, contributors), or None after a transient error
+        """
+        repo_collaborators = []
+        repo_contributors = []
+        
+        # Try to get collaborators (requires push access)
+        try:
+            repo_collaborators = [
+                {
+                    "username": collab.login,
+                    "node_id": collab.node_id,
+                    "avatar_url": collab.avatar_url,
+                    "type": "collaborator"
+                }
+                for collab in ctx.collaborators(repo)
+                if collab.login != user.login
+            ]
+        except Exception as e:
+            # Permission denied - skip collaborators; retry transient errors next time
+            if not is_definitive(e):
+                return None
+        
+        # Get contributors (commit authors) - this works for all public repos
+        try:
+            # Filter out the owner and already tracked collaborators
+            collab_usernames = {c["username"] for c in repo_collaborators}
+            repo_contributors = [
+                {
+                    "username": contrib.login,
+                    "node_id": contrib.node_id,
+                    "avatar_url": contrib.avatar_url,
+                    "contributions": contrib.contributions,
+                    "type": "contributor"
+                }
+                for contrib in ctx.contributors(repo)
+                if contrib.login != user.login and contrib.login not in collab_usernames
+            ]
+        except Exception as e:
+            # Empty or missing repository - skip contributors
+            if not is_definitive(e):
+                return None
+        
+        return repo_collaborators, repo_contributors
+    
+    def _get_repo_collaboration(self, user, repo, ctx: RepoFetchContext) -> Optional[Dict]:
+        """
+        Collaboration signals of a single repository, as read from the API.
+        
+        Returns:
+            The signals, or None after a transient error (so they are not
+            recorded in the snapshot)
+        """
+        signals = {
+            "collaborators": [],
+            "contributors": [],
+            "collaborative": False,
+            "issues": 0,
+            "pull_requests": 0,
+            "reviewed_pull_requests": 0
+        }
+        
+        # Count unique collaborators and contributors for owned repos
+        if not repo.fork and repo.owner.login == user.login:
+            try:
+                # Get collaborators
+                signals["collaborators"] = [
+                    collab.login for collab in ctx.collaborators(repo)
+                    if collab.login != user.login
+                ]
+            except Exception as e:
+                # No push access or an empty repository leaves the signal
+                # empty; anything else is retried by the next analysis
+                if not is_definitive(e):
+                    return None
+            
+            try:
+                # Get contributors
+                signals["contributors"] = [
+                    contrib.login for contrib in ctx.contributors(repo)
+                    if contrib.login != user.login
+                ]
+            except Exception as e:
+                if not is_definitive(e):
+                    return None
+            
+            # Check for team projects using alternative signals
+            # A project is likely collaborative if:
+            # - Has multiple contributors (based on commit count)
+            # - Has pull requests from others
+            # - Has active issue discussions
+            try:
+                # Check if repo has PRs from other users (indicates collaboration)
+                pulls = ctx.pulls(repo)[:20]
+                signals["collaborative"] = any(p.user.login != user.login for p in pulls)
+            except Exception as e:
+                if not is_definitive(e):
+                    return None
+        
+        # Count issues and PRs (limited to avoid rate limits)
+        try:
+            issues = ctx.issues(repo)[:10]
+            signals["issues"] = len([i for i in issues if not i.pull_request])
+            
+            # Count PR participation
+            pulls = ctx.pulls(repo)[:10]
+            signals["pull_requests"] = len(pulls)
+            
+            # Check for PR review comments
+            for pr in pulls[:5]:
+                try:
+                    reviews = ctx.reviews(repo, pr)[:5]
+                    if reviews:
+                        signals["reviewed_pull_requests"] += 1
+                except Exception as e:
+                    if not is_definitive(e):
+                        return None
+        except Exception as e:
+            if not is_definitive(e):
+                return None
+        
+        return signals
+    
+    def _calculate_collaboration_score(self, user, repos: List, ctx: RepoFetchContext, budget: RequestBudget) -> Dict:
         """Calculate comprehensive collaboration score and metrics."""
         
         # Initialize metrics
@@ -453,12 +811,18 @@ class GitHubAnalyzer:
         unique_collaborators = 0  # People with push access
         unique_contributors = 0  # Commit authors
         
-        # Analyze repositories (limit to prevent rate limiting)
-        analyzed_repos = repos[:30]
+        # Analyze repositories (sampled when the rate limit budget is low)
+        analyzed_repos = budget.select("collaboration", repos)
         all_collaborators_set = set()
         all_contributors_set = set()
         
-        for repo in analyzed_repos:
+        signals_by_repo = ctx.map_derived(
+            "collaboration",
+            lambda repo: self._get_repo_collaboration(user, repo, ctx),
+            analyzed_repos
+        )
+        
+        for repo, signals in zip(analyzed_repos, signals_by_repo):
             try:
                 # Check if it's a fork (collaboration indicator)
                 if repo.fork:
@@ -469,60 +833,18 @@ class GitHubAnalyzer:
                 if not repo.fork and repo.forks_count > 0:
                     repos_forked_by_others += repo.forks_count
                 
-                # Count unique collaborators and contributors for owned repos
-                if not repo.fork and repo.owner.login == user.login:
-                    try:
-                        # Get collaborators
-                        collabs = list(repo.get_collaborators())
-                        for collab in collabs:
-                            if collab.login != user.login:
-                                all_collaborators_set.add(collab.login)
-                    except:
-                        pass
-                    
-                    try:
-                        # Get contributors
-                        contribs = list(repo.get_contributors())
-                        for contrib in contribs:
-                            if contrib.login != user.login:
-                                all_contributors_set.add(contrib.login)
-                    except:
-                        pass
+                if signals is None:
+                    # Not fetched this time (transient error)
+                    continue
                 
-                # Check for team projects using alternative signals
-                if not repo.fork and repo.owner.login == user.login:
-                    # A project is likely collaborative if:
-                    # - Has multiple contributors (based on commit count)
-                    # - Has pull requests from others
-                    # - Has active issue discussions
-                    try:
-                        # Check if repo has PRs from other users (indicates collaboration)
-                        pulls = list(repo.get_pulls(state='all')[:20])
-                        other_contributor_prs = [p for p in pulls if p.user.login != user.login]
-                        if len(other_contributor_prs) > 0:
-                            collaborative_projects += 1
-                    except:
-                        pass
+                all_collaborators_set.update(signals["collaborators"])
+                all_contributors_set.update(signals["contributors"])
+                if signals["collaborative"]:
+                    collaborative_projects += 1
                 
-                # Count issues and PRs (limited to avoid rate limits)
-                try:
-                    issues = list(repo.get_issues(state='all')[:10])
-                    total_issues += len([i for i in issues if not i.pull_request])
-                    
-                    # Count PR participation
-                    pulls = list(repo.get_pulls(state='all')[:10])
-                    total_prs += len(pulls)
-                    
-                    # Check for PR review comments
-                    for pr in pulls[:5]:
-                        try:
-                            reviews = list(pr.get_reviews()[:5])
-                            if reviews:
-                                pr_review_participation += 1
-                        except:
-                            pass
-                except:
-                    pass
+                total_issues += signals["issues"]
+                total_prs += signals["pull_requests"]
+                pr_review_participation += signals["reviewed_pull_requests"]
                     
             except Exception:
                 continue
@@ -0,0 +1,101 @@
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from github.Requester import (
+    HTTPRequestsConnectionClass,
+    HTTPSRequestsConnectionClass,
+    Requester,
+)
+
+
+AdapterFactory = Callable[[BaseAdapter], BaseAdapter]
+
+
+class SharedSessionHTTPSConnection(HTTPSRequestsConnectionClass):
+    """
+    PyGithub connection class that sends every request through one shared
+    requests session per host, whose adapter can be wrapped (HTTP cache,
+    token routing, ...).
+
+    PyGithub stops reusing connections once custom connection classes are
+    injected, so the session lives here instead of on the connection to
+    keep HTTP keep-alive and the connection pool.
+    """
+
+    adapter_factory: Optional[AdapterFactory] = None
+    _sessions: Dict[Tuple[str, int], requests.Session] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, host: str, port: Optional[int] = None, strict: bool = False,
+                 timeout: Optional[int] = None, retry=None, pool_size: Optional[int] = None, **kwargs):
+        """Mimic HTTPSRequestsConnectionClass without creating a session per request."""
+        self.port = port if port else 443
+        self.host = host
+        self.protocol = "https"
+        self.timeout = timeout
+        self.verify = kwargs.get("verify", True)
+        self.retry = retry if retry is not None else requests.adapters.DEFAULT_RETRIES
+        self.pool_size = pool_size or requests.adapters.DEFAULT_POOLSIZE
+        self.session = self._shared_session()
+
+    def _shared_session(self) -> requests.Session:
+        """Get or create the session for this host."""
+        key = (self.host, self.port)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                # Disable .netrc fallback, like PyGithub does
+                session.auth = Requester.noopAuth
+                adapter: BaseAdapter = HTTPAdapter(
+                    max_retries=self.retry,
+                    pool_connections=self.pool_size,
+                    pool_maxsize=self.pool_size,
+                )
+                if self.adapter_factory:
+                    adapter = self.adapter_factory(adapter)
+                session.mount("https://", adapter)
+                self._sessions[key] = session
+        return session
+
+    def close(self) -> None:
+        """The session is shared between connections, so keep it open."""
+
+
+def install(adapter_factory: AdapterFactory) -> None:
+    """
+    Route all PyGithub HTTPS traffic through adapter_factory(HTTPAdapter).
+
+    Must be called before the Github client is created.
+
+    Args:
+        adapter_factory: Wraps the default transport adapter
+    """
+    with SharedSessionHTTPSConnection._lock:
+        for session in SharedSessionHTTPSConnection._sessions.values():
+            session.close()
+        SharedSessionHTTPSConnection._sessions = {}
+        SharedSessionHTTPSConnection.adapter_factory = staticmethod(adapter_factory)
+
+    Requester.injectConnectionClasses(HTTPRequestsConnectionClass, SharedSessionHTTPSConnection)
+
+
+def session() -> requests.Session:
+    """New session for non-PyGithub calls (e.g. GraphQL) using the installed adapter."""
+    new_session = requests.Session()
+    adapter_factory = SharedSessionHTTPSConnection.adapter_factory
+    if adapter_factory:
+        new_session.mount("https://", adapter_factory(HTTPAdapter()))
+    return new_session
+
+
+def uninstall() -> None:
+    """Restore PyGithub's default connection classes."""
+    Requester.resetConnectionClasses()
+    with SharedSessionHTTPSConnection._lock:
+        for session in SharedSessionHTTPSConnection._sessions.values():
+            session.close()
+        SharedSessionHTTPSConnection._sessions = {}
+        SharedSessionHTTPSConnection.adapter_factory = None
@@ -0,0 +1,328 @@
+import os
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import requests
+
+from fetch_context import RepoFetchContext, punch_card_matrix
+
+
+DEFAULT_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# repositoryOwner resolves organisations as well as users
+USER_QUERY = """
+query($login: String!) {
+  repositoryOwner(login: $login) {
+    __typename
+    id
+    login
+    avatarUrl
+    repositories(ownerAffiliations: OWNER, privacy: PUBLIC) { totalCount }
+    ... on User {
+      name
+      bio
+      websiteUrl
+      location
+      email
+      twitterUsername
+      company
+      isHireable
+      createdAt
+      updatedAt
+      gists(privacy: PUBLIC) { totalCount }
+      followers { totalCount }
+      following { totalCount }
+    }
+    ... on Organization {
+      name
+      description
+      websiteUrl
+      location
+      email
+      twitterUsername
+      createdAt
+      updatedAt
+    }
+  }
+}
+"""
+
+REPOS_QUERY = """
+query($login: String!, $userId: ID, $isUser: Boolean!, $pageSize: Int!, $after: String) {
+  repositoryOwner(login: $login) {
+    repositories(
+      ownerAffiliations: OWNER
+      privacy: PUBLIC
+      first: $pageSize
+      after: $after
+      orderBy: {field: NAME, direction: ASC}
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        description
+        url
+        homepageUrl
+        isFork
+        createdAt
+        updatedAt
+        pushedAt
+        stargazerCount
+        forkCount
+        owner { login }
+        primaryLanguage { name }
+        languages(first: 20) { edges { size node { name } } }
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+        openIssues: issues(states: OPEN) { totalCount }
+        openPulls: pullRequests(states: OPEN) { totalCount }
+        issues(first: 10, orderBy: {field: CREATED_AT, direction: DESC}) {
+          nodes { number }
+        }
+        pullRequests(first: 20, orderBy: {field: CREATED_AT, direction: DESC}) {
+          nodes { number author { login } reviews(first: 5) { totalCount } }
+        }
+        defaultBranchRef {
+          target {
+            ... on Commit {
+              authored: history(author: {id: $userId}) @include(if: $isUser) { totalCount }
+              history(first: 100) { nodes { authoredDate } }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+class GraphQLError(Exception):
+    """Raised when the GraphQL API returns errors."""
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse a GraphQL DateTime into a timezone-aware datetime."""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+class GraphQLClient:
+    """Minimal GitHub GraphQL v4 client."""
+
+    def __init__(self, token: str, url: Optional[str] = None, session: Optional[requests.Session] = None):
+        """Initialize the client with a token and optional endpoint URL."""
+        self.url = url or os.getenv("GITHUB_GRAPHQL_URL", DEFAULT_GRAPHQL_URL)
+        self.session = session or requests.Session()
+        self.headers = {"Authorization": f"bearer {token}"}
+
+    def query(self, query: str, variables: Dict, allow_partial: bool = False) -> Dict:
+        """
+        Run a query and return its `data` payload.
+
+        Args:
+            query: GraphQL query
+            variables: Query variables
+            allow_partial: Return the data of a response that also has errors
+                (e.g. a `nodes` lookup where some IDs no longer resolve)
+                instead of raising, as long as it has any
+
+        Raises:
+            GraphQLError: If the response has errors (and, with allow_partial,
+                no data)
+        """
+        response = self.session.post(
+            self.url,
+            json={"query": query, "variables": variables},
+            headers=self.headers,
+            timeout=30
+        )
+        response.raise_for_status()
+        payload = response.json()
+
+        if payload.get("errors") and not (allow_partial and payload.get("data")):
+            messages = "; ".join(e.get("message", "") for e in payload["errors"])
+            raise GraphQLError(messages)
+
+        return payload["data"]
+
+
+class GraphQLUser:
+    """
+    User object exposing the NamedUser attributes the analyzer reads.
+
+    Organisations have no bio, company, gists or followers in GraphQL; their
+    description stands in for the bio and the counts are 0.
+    """
+
+    def __init__(self, node: Dict):
+        """Build the user from a GraphQL `repositoryOwner` node (User or Organization)."""
+        self.node_id = node["id"]
+        self.type = node["__typename"]
+        self.login = node["login"]
+        self.name = node.get("name")
+        self.bio = node.get("bio") or node.get("description")
+        self.avatar_url = node.get("avatarUrl")
+        self.blog = node.get("websiteUrl")
+        self.location = node.get("location")
+        self.email = node.get("email") or None
+        self.twitter_username = node.get("twitterUsername")
+        self.company = node.get("company")
+        self.hireable = node.get("isHireable")
+        self.created_at = _parse_datetime(node.get("createdAt"))
+        self.updated_at = _parse_datetime(node.get("updatedAt"))
+        self.public_repos = node["repositories"]["totalCount"]
+        self.public_gists = (node.get("gists") or {}).get("totalCount", 0)
+        self.followers = (node.get("followers") or {}).get("totalCount", 0)
+        self.following = (node.get("following") or {}).get("totalCount", 0)
+
+
+class GraphQLRepository:
+    """
+    Repository object exposing the Repository attributes the analyzer reads.
+
+    Anything not covered by the bulk query (collaborators, contributors)
+    is delegated to a lazy PyGithub Repository, which costs no request
+    until it is actually used.
+    """
+
+    def __init__(self, node: Dict, rest_repo):
+        """Build the repository from a GraphQL `Repository` node."""
+        self._rest_repo = rest_repo
+        self.name = node["name"]
+        self.full_name = node["nameWithOwner"]
+        self.description = node.get("description")
+        self.html_url = node["url"]
+        self.homepage = node.get("homepageUrl")
+        self.fork = node["isFork"]
+        self.owner = SimpleNamespace(login=node["owner"]["login"])
+        self.language = (node.get("primaryLanguage") or {}).get("name")
+        self.stargazers_count = node["stargazerCount"]
+        # The REST API reports stargazers as watchers_count, keep that shape
+        self.watchers_count = node["stargazerCount"]
+        self.forks_count = node["forkCount"]
+        self.open_issues_count = node["openIssues"]["totalCount"] + node["openPulls"]["totalCount"]
+        self.created_at = _parse_datetime(node.get("createdAt"))
+        self.updated_at = _parse_datetime(node.get("updatedAt"))
+        self.pushed_at = _parse_datetime(node.get("pushedAt"))
+
+    def __getattr__(self, name):
+        """Fall back to the lazy REST repository for everything else."""
+        return getattr(self._rest_repo, name)
+
+
+class GraphQLBackend:
+    """
+    Loads a user and all their repositories in a few paginated GraphQL
+    queries, priming a RepoFetchContext with languages, topics, pull
+    requests, issues, reviews and commit data so analyzer stages do not
+    issue per-repo REST calls for them.
+    """
+
+    def __init__(self, github, token: str, url: Optional[str] = None,
+                 page_size: Optional[int] = None, session: Optional[requests.Session] = None):
+        """
+        Initialize the backend.
+
+        Args:
+            github: PyGithub client, used for lazy REST fallbacks
+            token: GitHub token (the GraphQL API does not allow anonymous access)
+            url: GraphQL endpoint, e.g. a local stub server
+            page_size: Repositories per page
+            session: requests session to send queries through
+        """
+        self.github = github
+        self.client = GraphQLClient(token, url, session)
+        self.page_size = page_size or int(os.getenv("GITHUB_GRAPHQL_PAGE_SIZE", 25))
+
+    def load_user(self, username: str) -> GraphQLUser:
+        """
+        Fetch the user or organisation.
+
+        Args:
+            username: GitHub login to load
+
+        Returns:
+            The user
+        """
+        data = self.client.query(USER_QUERY, {"login": username})
+        if not data.get("repositoryOwner"):
+            raise GraphQLError(f"Could not resolve to a User or Organization with the login of '{username}'")
+        return GraphQLUser(data["repositoryOwner"])
+
+    def load_repos(self, user: GraphQLUser, ctx: RepoFetchContext) -> List[GraphQLRepository]:
+        """
+        Fetch the user's repositories, priming ctx along the way.
+
+        Args:
+            user: User returned by `load_user`
+            ctx: Fetch context of the current analysis
+
+        Returns:
+            The repositories
+        """
+        repos = []
+        after = None
+        is_user = user.type == "User"
+
+        while True:
+            data = self.client.query(REPOS_QUERY, {
+                "login": user.login,
+                # Organisations author no commits
+                "userId": user.node_id if is_user else None,
+                "isUser": is_user,
+                "pageSize": self.page_size,
+                "after": after
+            })
+            connection = data["repositoryOwner"]["repositories"]
+
+            for node in connection["nodes"]:
+                rest_repo = self.github.get_repo(node["nameWithOwner"], lazy=True)
+                repo = GraphQLRepository(node, rest_repo)
+                self._prime(ctx, repo, node)
+                repos.append(repo)
+
+            if not connection["pageInfo"]["hasNextPage"]:
+                break
+            after = connection["pageInfo"]["endCursor"]
+
+        return repos
+
+    def _prime(self, ctx: RepoFetchContext, repo: GraphQLRepository, node: Dict) -> None:
+        """Store the bulk-fetched sub-resources of a repository in ctx."""
+        ctx.prime("languages", repo, {
+            edge["node"]["name"]: edge["size"]
+            for edge in node["languages"]["edges"]
+        })
+        ctx.prime("topics", repo, [
+            topic_node["topic"]["name"]
+            for topic_node in node["repositoryTopics"]["nodes"]
+        ])
+
+        # GraphQL issues never include pull requests
+        ctx.prime("issues", repo, [
+            SimpleNamespace(number=issue["number"], pull_request=None)
+            for issue in node["issues"]["nodes"]
+        ])
+
+        pulls = []
+        for pr in node["pullRequests"]["nodes"]:
+            author = (pr.get("author") or {}).get("login", "ghost")
+            pull = SimpleNamespace(number=pr["number"], user=SimpleNamespace(login=author))
+            pulls.append(pull)
+            # Only the count is used, so placeholders stand in for review objects
+            ctx.prime("reviews", repo, [None] * min(pr["reviews"]["totalCount"], ctx.REVIEWS_LIMIT), pr["number"])
+        ctx.prime("pulls", repo, pulls)
+
+        target = (node.get("defaultBranchRef") or {}).get("target") or {}
+        ctx.prime("commit_count", repo, (target.get("authored") or {}).get("totalCount", 0))
+        # GraphQL has no punch card; build it from the most recent commits
+        authored_dates = [
+            _parse_datetime(commit["authoredDate"])
+            for commit in (target.get("history") or {}).get("nodes", [])
+        ]
+        ctx.prime("punch_card", repo, punch_card_matrix(
+            [(date.isoweekday() % 7, date.hour, 1) for date in authored_dates if date]
+        ))
@@ -0,0 +1,185 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+# Response header marking bodies served from the cache after a 304
+CACHE_STATUS_HEADER = "X-GitFolio-Cache"
+
+
+class HTTPCacheStore:
+    """
+    Persistent SQLite store of GET responses with their validators
+    (ETag / Last-Modified), shared by threads and worker processes.
+    """
+
+    def __init__(self, path: str, max_age_days: int = 30):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite file path
+            max_age_days: Entries not revalidated for this long are pruned on open
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                encoding TEXT,
+                body BLOB NOT NULL,
+                stored_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "DELETE FROM responses WHERE stored_at < ?",
+            (time.time() - max_age_days * 86400,)
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached entry for key, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, status, headers, encoding, body FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "etag": row[0],
+            "last_modified": row[1],
+            "status": row[2],
+            "headers": json.loads(row[3]),
+            "encoding": row[4],
+            "body": row[5]
+        }
+
+    def put(self, key: str, response: Response) -> None:
+        """Store a response together with its validators."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    response.status_code,
+                    json.dumps({
+                        name: value for name, value in response.headers.items()
+                        # The stored body is already decoded
+                        if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+                    }),
+                    response.encoding,
+                    response.content,
+                    time.time()
+                )
+            )
+            self._conn.commit()
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as revalidated."""
+        with self._lock:
+            self._conn.execute("UPDATE responses SET stored_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+class ConditionalCacheAdapter(BaseAdapter):
+    """
+    Transport adapter that revalidates cached GET responses with
+    If-None-Match / If-Modified-Since. GitHub does not count 304 responses
+    against the rate limit; on a 304 the stored body is returned as a 200
+    with the fresh response's headers (rate limit, date) merged in.
+    """
+
+    def __init__(self, inner: BaseAdapter, store: HTTPCacheStore):
+        """Wrap inner, caching its GET responses in store."""
+        super().__init__()
+        self.inner = inner
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cache_key(request: PreparedRequest) -> str:
+        """Key a request by URL, media type and whether it is authenticated."""
+        # Public data does not depend on which token asked for it, but
+        # anonymous and authenticated responses can differ
+        auth = "auth" if request.headers.get("Authorization") else "anon"
+        return f"{request.url}|{request.headers.get('Accept', '')}|{auth}"
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        """Send request, revalidating against the cache when possible."""
+        if request.method != "GET":
+            return self.inner.send(request, **kwargs)
+
+        key = self.cache_key(request)
+        entry = self.store.get(key)
+        if entry:
+            if entry["etag"]:
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.inner.send(request, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self.hits += 1
+            self.store.touch(key)
+            return self._from_cache(request, response, entry)
+
+        self.misses += 1
+        if response.status_code == 200 and (
+            response.headers.get("ETag") or response.headers.get("Last-Modified")
+        ):
+            self.store.put(key, response)
+        return response
+
+    @staticmethod
+    def _from_cache(request: PreparedRequest, not_modified: Response, entry: Dict) -> Response:
+        """Build a 200 response from a cached entry and a 304 response."""
+        headers = CaseInsensitiveDict(entry["headers"])
+        headers.update({
+            name: value for name, value in not_modified.headers.items()
+            if name.lower() not in ("content-length", "transfer-encoding")
+        })
+        headers[CACHE_STATUS_HEADER] = "revalidated"
+
+        response = Response()
+        response.status_code = entry["status"]
+        response.headers = headers
+        response.encoding = entry["encoding"]
+        response._content = entry["body"]
+        response.url = not_modified.url
+        response.request = request
+        response.reason = "OK"
+        response.connection = not_modified.connection
+        response.elapsed = not_modified.elapsed
+        return response
+
+    def close(self) -> None:
+        """Close the wrapped adapter."""
+        self.inner.close()
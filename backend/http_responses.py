@@ -0,0 +1,170 @@
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+# Optional fast paths: orjson serializes several times faster than json, and
+# brotli compresses JSON noticeably smaller than gzip
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 1024
+
+# Compressed bodies are cached per etag; most profiles are read many times
+COMPRESSED_CACHE_ENTRIES = 512
+
+# Compression levels (brotli quality, gzip level): cached bodies are
+# compressed once and served many times, so they get the smallest output;
+# uncached ones are compressed per request on the event loop, so they get
+# a level that is several times faster for a few percent more bytes
+CACHED_LEVELS = {"br": 9, "gzip": 9}
+DYNAMIC_LEVELS = {"br": 4, "gzip": 6}
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON encoding of obj."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """Parse JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def strong_etag(body: bytes) -> str:
+    """Strong ETag of a response body."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match covers etag."""
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*":
+        return True
+    return etag in [tag.strip() for tag in if_none_match.split(",")]
+
+
+def negotiate_encoding(request: Request) -> Optional[str]:
+    """
+    Pick the response encoding from Accept-Encoding.
+
+    Returns:
+        "br", "gzip", or None for identity
+    """
+    accepted = {}
+    for item in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.lower()] = quality
+
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class CompressedCache:
+    """Bounded LRU of compressed bodies keyed by (etag, encoding)."""
+
+    def __init__(self, max_entries: int = COMPRESSED_CACHE_ENTRIES):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum compressed bodies kept
+        """
+        self.max_entries = max_entries
+        self._bodies: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etag: str, encoding: str, body: bytes) -> bytes:
+        """Body compressed with encoding, compressing it on first use."""
+        key = (etag, encoding)
+        with self._lock:
+            compressed = self._bodies.get(key)
+            if compressed is not None:
+                self._bodies.move_to_end(key)
+                return compressed
+
+        compressed = compress(body, encoding, CACHED_LEVELS[encoding])
+        with self._lock:
+            self._bodies[key] = compressed
+            while len(self._bodies) > self.max_entries:
+                self._bodies.popitem(last=False)
+        return compressed
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    """Compress body with "br" or "gzip" at the given quality / level."""
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+compressed_cache = CompressedCache()
+
+
+def json_response(request: Request, body: bytes, etag: Optional[str] = None,
+                  headers: Optional[Dict[str, str]] = None,
+                  cache_control: str = "no-cache") -> Response:
+    """
+    Response for pre-encoded JSON, with conditional and compressed variants.
+
+    With an etag, a matching If-None-Match returns 304 and compressed
+    bodies are cached; without one the body is compressed per request, at
+    the faster DYNAMIC_LEVELS.
+    Compressed variants get their own strong ETag (suffixed with the
+    encoding), as they are different byte sequences.
+
+    Args:
+        request: Incoming request (If-None-Match, Accept-Encoding)
+        body: Compact JSON bytes
+        etag: Strong ETag of body, if it is cacheable
+        headers: Extra response headers
+        cache_control: Cache-Control header value
+
+    Returns:
+        Response
+    """
+    headers = dict(headers or {})
+    headers["Cache-Control"] = cache_control
+    headers["Vary"] = "Accept-Encoding"
+    encoding = negotiate_encoding(request) if len(body) >= MIN_COMPRESS_SIZE else None
+
+    if etag:
+        if encoding:
+            etag = etag[:-1] + "-" + encoding + '"'
+        headers["ETag"] = etag
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+
+    if encoding:
+        body = compressed_cache.get(etag, encoding, body) if etag else compress(body, encoding, DYNAMIC_LEVELS[encoding])
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,359 @@
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from typing import Dict, List, Optional
+
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+JOB_COLUMNS = (
+    "id", "kind", "username", "priority", "status", "progress", "attempts",
+    "max_attempts", "error", "created_at", "run_after", "started_at",
+    "finished_at", "heartbeat_at", "worker"
+)
+
+
+class JobQueue:
+    """
+    Durable SQLite-backed queue of analysis jobs, shared by the API process
+    and the worker processes.
+
+    Jobs are claimed highest priority first (oldest first within a
+    priority). A failed job is retried with exponential backoff until
+    max_attempts is reached. Running jobs whose worker stopped sending
+    heartbeats (crash, restart) are put back in the queue by `recover`.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3, retry_delay: float = 30.0):
+        """
+        Open (or create) the queue database.
+
+        Args:
+            path: SQLite file path
+            max_attempts: Default attempts per job before it fails for good
+            retry_delay: Seconds before the first retry; doubled on every retry
+        """
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # Autocommit mode; claims use explicit write transactions
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                username TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL,
+                progress TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                error TEXT,
+                created_at REAL NOT NULL,
+                run_after REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                heartbeat_at REAL,
+                worker TEXT
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, priority DESC, created_at)"
+        )
+
+    def _row(self, row) -> Optional[Dict]:
+        return dict(zip(JOB_COLUMNS, row)) if row else None
+
+    def enqueue(self, username: str, priority: int = 0, kind: str = "analyze",
+                max_attempts: Optional[int] = None) -> str:
+        """
+        Queue a job, or join the unfinished job of the same kind and user.
+
+        Joining raises the queued job's priority if the new request's is higher.
+
+        Returns:
+            Job id
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE kind = ? AND lower(username) = ? AND status IN (?, ?)",
+                    (kind, username.lower(), QUEUED, RUNNING)
+                ).fetchone()
+                if row:
+                    job_id = row[0]
+                    self._conn.execute(
+                        "UPDATE jobs SET priority = MAX(priority, ?) WHERE id = ?",
+                        (priority, job_id)
+                    )
+                else:
+                    job_id = uuid.uuid4().hex
+                    now = time.time()
+                    self._conn.execute(
+                        "INSERT INTO jobs (id, kind, username, priority, status, max_attempts, created_at, run_after) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (job_id, kind, username, priority, QUEUED,
+                         max_attempts or self.max_attempts, now, now)
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return job_id
+
+    def claim(self, worker: str) -> Optional[Dict]:
+        """Take the next runnable job, or None if there is none."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? AND run_after <= ? "
+                    "ORDER BY priority DESC, created_at LIMIT 1",
+                    (QUEUED, now)
+                ).fetchone()
+                if row:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, started_at = ?, "
+                        "heartbeat_at = ?, worker = ?, error = NULL, progress = NULL WHERE id = ?",
+                        (RUNNING, now, now, worker, row[0])
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.get(row[0]) if row else None
+
+    def heartbeat(self, job_id: str, progress: Optional[str] = None) -> None:
+        """Record that a running job is alive, optionally with its progress."""
+        with self._lock:
+            if progress is None:
+                self._conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time(), job_id))
+            else:
+                self._conn.execute(
+                    "UPDATE jobs SET heartbeat_at = ?, progress = ? WHERE id = ?",
+                    (time.time(), progress, job_id)
+                )
+
+    def complete(self, job_id: str) -> None:
+        """Mark a job as succeeded."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, error = NULL WHERE id = ?",
+                (SUCCEEDED, time.time(), job_id)
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Record a failed attempt: retry with backoff, or fail for good."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._fail(job_id, error)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _fail(self, job_id: str, error: str) -> None:
+        row = self._conn.execute(
+            "SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if not row:
+            return
+        attempts, max_attempts = row
+        now = time.time()
+        if attempts < max_attempts:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, run_after = ?, worker = NULL WHERE id = ?",
+                (QUEUED, error, now + self.retry_delay * (2 ** (attempts - 1)), job_id)
+            )
+        else:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                (FAILED, error, now, job_id)
+            )
+
+    def recover(self, heartbeat_timeout: float) -> int:
+        """
+        Requeue (or fail) running jobs whose worker stopped sending heartbeats.
+
+        Returns:
+            Number of jobs recovered
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                stale = self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? AND heartbeat_at < ?",
+                    (RUNNING, time.time() - heartbeat_timeout)
+                ).fetchall()
+                for (job_id,) in stale:
+                    self._fail(job_id, "Worker stopped responding")
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(stale)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Job by id, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._row(row)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+
+def _run_job(queue: JobQueue, job: Dict, heartbeat_interval: float) -> None:
+    """Run one claimed job in this worker process."""
+    # Imported here: loading the API module sets up the analyzer and chart generator
+    from main import analyze_and_save
+
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(heartbeat_interval):
+            queue.heartbeat(job["id"])
+
+    beater = threading.Thread(target=beat, daemon=True)
+    beater.start()
+    try:
+        analyze_and_save(job["username"], on_section=lambda section, section_data: queue.heartbeat(job["id"], section))
+        queue.complete(job["id"])
+    except Exception as e:
+        traceback.print_exc()
+        queue.fail(job["id"], str(getattr(e, "detail", None) or e))
+    finally:
+        stop.set()
+        beater.join()
+
+
+def worker_main(path: str, max_attempts: int, retry_delay: float,
+                poll_interval: float, heartbeat_interval: float) -> None:
+    """Entry point of a worker process: claim and run jobs forever."""
+    queue = JobQueue(path, max_attempts, retry_delay)
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    # Each worker is already its own process; render charts in it, not in a nested pool
+    os.environ["CHART_WORKERS"] = "0"
+    while True:
+        job = queue.claim(worker)
+        if job is None:
+            time.sleep(poll_interval)
+            continue
+        print(f"[{worker}] Running job {job['id']} ({job['kind']} {job['username']}, attempt {job['attempts']})")
+        _run_job(queue, job, heartbeat_interval)
+
+
+class JobWorkerPool:
+    """
+    Supervises the worker processes: starts them, restarts any that die,
+    and recovers jobs abandoned by crashed workers.
+    """
+
+    def __init__(self, queue: JobQueue, workers: int, poll_interval: float = 1.0,
+                 heartbeat_timeout: float = 120.0):
+        """
+        Initialize the pool.
+
+        Args:
+            queue: Queue the workers consume
+            workers: Number of worker processes
+            poll_interval: Seconds an idle worker waits before polling again
+            heartbeat_timeout: Seconds without heartbeat before a running job is recovered
+        """
+        self.queue = queue
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        # Fresh interpreters: forking a process with running threads is unsafe
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: List[multiprocessing.Process] = []
+        self._stop = threading.Event()
+        self._supervisor: Optional[threading.Thread] = None
+
+    def _spawn(self) -> multiprocessing.Process:
+        process = self._context.Process(
+            target=worker_main,
+            args=(
+                self.queue.path, self.queue.max_attempts, self.queue.retry_delay,
+                self.poll_interval, self.heartbeat_timeout / 4
+            ),
+            name="gitfolio-job-worker",
+            daemon=True
+        )
+        process.start()
+        return process
+
+    def start(self) -> None:
+        """Start the workers and the supervisor thread."""
+        self._processes = [self._spawn() for _ in range(self.workers)]
+        self._supervisor = threading.Thread(target=self._supervise, name="job-supervisor", daemon=True)
+        self._supervisor.start()
+
+    def _supervise(self) -> None:
+        while not self._stop.wait(self.poll_interval * 5):
+            for i, process in enumerate(self._processes):
+                if not process.is_alive():
+                    print(f"Job worker {process.pid} exited ({process.exitcode}), restarting")
+                    self._processes[i] = self._spawn()
+            try:
+                recovered = self.queue.recover(self.heartbeat_timeout)
+                if recovered:
+                    print(f"Recovered {recovered} abandoned job(s)")
+            except sqlite3.Error as e:
+                print(f"Warning: job recovery failed: {e}")
+
+    def stop(self) -> None:
+        """Stop the supervisor and terminate the workers; their jobs are recovered on restart."""
+        self._stop.set()
+        for process in self._processes:
+            process.terminate()
+        for process in self._processes:
+            process.join(timeout=5)
+
+    def status(self) -> Dict:
+        """Worker and queue summary."""
+        return {
+            "workers": self.workers,
+            "alive": sum(1 for process in self._processes if process.is_alive()),
+            "jobs": self.queue.counts()
+        }
+
+
+def queue_from_env() -> JobQueue:
+    """Job queue as configured by JOB_DB, JOB_MAX_ATTEMPTS and JOB_RETRY_DELAY."""
+    return JobQueue(
+        os.getenv("JOB_DB", "data/jobs.sqlite3"),
+        max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", 3)),
+        retry_delay=float(os.getenv("JOB_RETRY_DELAY", 30))
+    )
+
+
+def pool_from_env(queue: JobQueue) -> Optional[JobWorkerPool]:
+    """Worker pool as configured by JOB_WORKERS (0 disables) and JOB_HEARTBEAT_TIMEOUT."""
+    workers = int(os.getenv("JOB_WORKERS", 2))
+    if workers <= 0:
+        return None
+    return JobWorkerPool(queue, workers, heartbeat_timeout=float(os.getenv("JOB_HEARTBEAT_TIMEOUT", 120)))
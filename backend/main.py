@@ -1,17 +1,25 @@
 import os
-import json
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import FileResponse, StreamingResponse
 from dotenv import load_dotenv
-from typing import Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from pydantic import BaseModel
 from datetime import datetime, timedelta, timezone
-import uvicorn
+from collections import deque
+from queue import SimpleQueue
 
-from github_analyzer import GitHubAnalyzer
-from charts import ChartGenerator
+from charts import (
+    ChartGenerator, CHART_MEDIA_TYPES, CHART_VERSION_RE, chart_etag, chart_pool_from_env,
+    negotiate_chart, prune_chart_store
+)
+from http_responses import dumps, etag_matches, json_response
+from profile_store import store_from_env
+from chart_specs import CHART_SPEC_VERSION, chart_spec, chart_spec_urls
+import jobs
 
 # Load environment variables
 load_dotenv()
@@ -29,19 +37,52 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Age", "ETag", "X-Analyzed-At"],
 )
 
 # Create necessary directories
 os.makedirs("data", exist_ok=True)
 os.makedirs("charts", exist_ok=True)
 
-# Mount static files for charts
-app.mount("/charts", StaticFiles(directory="charts"), name="charts")
-
 # Initialize services
 github_token = os.getenv("GITHUB_TOKEN")
-analyzer = GitHubAnalyzer(github_token)
-chart_generator = ChartGenerator()
+# Created on first analysis (see get_analyzer), so serving stored profiles
+# and charts never imports PyGithub, requests or numpy
+analyzer = None
+analyzer_lock = threading.Lock()
+# "server" renders chart images; "client" only publishes chart specs, which
+# the frontend draws itself, so no chart is rendered on the server
+CHART_RENDERING = os.getenv("CHART_RENDERING", "client").lower()
+
+# Charts render in a process pool shared by all analyses (started with the
+# app); nothing is rendered, so no pool is needed, in client mode
+chart_pool = chart_pool_from_env() if CHART_RENDERING != "client" else None
+chart_generator = ChartGenerator(pool=chart_pool)
+profile_store = store_from_env()
+
+# Analyses run off the event loop, at most ANALYSIS_WORKERS at a time
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", 4))
+analysis_executor = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS, thread_name_prefix="analysis")
+analysis_slots = threading.BoundedSemaphore(ANALYSIS_WORKERS)
+
+# Profiles of all batches together are analyzed BATCH_WORKERS at a time,
+# leaving analysis workers free for single-profile requests
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS") or max(1, ANALYSIS_WORKERS // 2))
+BATCH_MAX_USERNAMES = int(os.getenv("BATCH_MAX_USERNAMES", 100))
+batch_slots = threading.BoundedSemaphore(BATCH_WORKERS)
+
+# In-flight analyses by username; concurrent requests share one (single-flight)
+inflight_analyses: Dict[str, "AnalysisFuture"] = {}
+inflight_lock = threading.Lock()
+
+# Profiles older than the soft TTL are served stale while a refresh runs in
+# the background; past the hard TTL they are re-analyzed before serving
+PROFILE_SOFT_TTL = timedelta(hours=float(os.getenv("PROFILE_SOFT_TTL_HOURS", 24)))
+PROFILE_HARD_TTL = timedelta(hours=float(os.getenv("PROFILE_HARD_TTL_HOURS", 168)))
+
+# Durable queue of background analyses; workers are started with the app
+job_queue = jobs.queue_from_env()
+job_workers: Optional[jobs.JobWorkerPool] = None
 
 
 class AnalyzeRequest(BaseModel):
@@ -49,6 +90,23 @@ class AnalyzeRequest(BaseModel):
     username: str
 
 
+class AnalyzeJobRequest(BaseModel):
+    """Request model for queued profile analysis."""
+    username: str
+    priority: int = 0
+
+
+class AnalyzeBatchRequest(BaseModel):
+    """Request model for batch profile analysis."""
+    usernames: List[str]
+
+
+class AnalyzeBatchJobRequest(BaseModel):
+    """Request model for queued batch profile analysis."""
+    usernames: List[str]
+    priority: int = 0
+
+
 class AnalyzeResponse(BaseModel):
     """Response model for analysis endpoint."""
     status: str
@@ -56,57 +114,331 @@ class AnalyzeResponse(BaseModel):
     data: Optional[dict] = None
 
 
-def analyze_and_save(username: str) -> dict:
-    """Analyze a GitHub profile and save results."""
+def get_analyzer():
+    """The shared GitHubAnalyzer, imported and created on first use."""
+    global analyzer
+    with analyzer_lock:
+        if analyzer is None:
+            from github_analyzer import GitHubAnalyzer
+            analyzer = GitHubAnalyzer(github_token)
+        return analyzer
+
+
+def generate_charts(username: str, profile_data: dict) -> Dict[str, str]:
+    """Generate a profile's charts and return their URLs."""
+    # Generate charts into the user-specific folder, under versioned
+    # filenames so chart URLs can be cached as immutable
+    print("Generating charts...")
+    charts = chart_generator.generate_all_charts(profile_data, chart_generator.context(username))
+    
+    # Chart paths include the username folder
+    return {
+        name: f"/charts/{username}/{os.path.basename(path)}" 
+        for name, path in charts.items()
+    }
+
+
+def chart_section(username: str, profile_data: dict) -> dict:
+    """
+    Chart keys of a profile: "chart_specs" (URLs of the chart data for
+    client-side drawing) and, unless CHART_RENDERING is "client", "charts"
+    (URLs of the rendered images).
+    """
+    section = {"chart_specs": chart_spec_urls(username, profile_data)}
+    if CHART_RENDERING != "client":
+        section["charts"] = generate_charts(username, profile_data)
+    return section
+
+
+def save_profile(username: str, profile_data: dict) -> None:
+    """Save analyzed profile data to the profile store."""
+    meta = profile_store.put(username, profile_data)
+    print(f"Analysis complete! Saved profile of {username} ({meta['size']} bytes)")
+
+
+def report_failure(username: str, e: Exception) -> None:
+    """Log a failed analysis with its traceback."""
+    import traceback
+    print(f"ERROR: Analysis failed for {username}")
+    print(f"Error type: {type(e).__name__}")
+    print(f"Error message: {str(e)}")
+    print("Full traceback:")
+    traceback.print_exc()
+
+
+def analyze_and_save(username: str, on_section: Optional[Callable[[str, dict], None]] = None) -> dict:
+    """
+    Analyze a GitHub profile and save results.
+    
+    Args:
+        username: GitHub username to analyze
+        on_section: Called with the name and profile_data keys of every
+            finished section (progress)
+    """
     try:
         # Analyze profile
         print(f"Analyzing profile: {username}")
-        profile_data = analyzer.analyze_profile(username)
-        
-        # Set username for chart generator to use user-specific folder
-        chart_generator.set_username(username)
-        
-        # Generate charts
-        print("Generating charts...")
-        charts = chart_generator.generate_all_charts(profile_data)
+        profile_data = {}
+        for section, section_data in get_analyzer().analyze_profile_iter(username):
+            profile_data.update(section_data)
+            if on_section:
+                on_section(section, section_data)
         
-        # Verify all chart files exist before proceeding
-        import time
-        for chart_path in charts.values():
-            max_wait = 5  # Maximum 5 seconds
-            waited = 0
-            while not os.path.exists(chart_path) and waited < max_wait:
-                time.sleep(0.1)
-                waited += 0.1
-            if not os.path.exists(chart_path):
-                print(f"Warning: Chart file {chart_path} not found after waiting")
+        # Add chart paths to profile data
+        charts = chart_section(username, profile_data)
+        profile_data.update(charts)
         
-        # Add chart paths to profile data (include username folder)
-        profile_data["charts"] = {
-            name: f"/charts/{username}/{os.path.basename(path)}" 
-            for name, path in charts.items()
-        }
-        
-        # Save to username-specific file only
-        username_file = f"data/{username}.json"
-        
-        with open(username_file, 'w') as f:
-            json.dump(profile_data, f, indent=2)
-        
-        print(f"Analysis complete! Data saved to {username_file}")
+        # Saved before the charts section: chart specs are served from the stored profile
+        save_profile(username, profile_data)
+        if on_section:
+            on_section("charts", charts)
         
         return profile_data
         
     except Exception as e:
-        import traceback
-        print(f"ERROR: Analysis failed for {username}")
-        print(f"Error type: {type(e).__name__}")
-        print(f"Error message: {str(e)}")
-        print("Full traceback:")
-        traceback.print_exc()
+        report_failure(username, e)
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
+class AnalysisFuture(Future):
+    """
+    Future of an in-flight analysis that also records its finished sections,
+    so every request sharing the analysis can follow its progress.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.sections: List[Tuple[str, dict]] = []
+        self._progress = threading.Condition()
+        self.add_done_callback(lambda _: self._notify())
+    
+    def _notify(self) -> None:
+        with self._progress:
+            self._progress.notify_all()
+    
+    def add_section(self, section: str, section_data: dict) -> None:
+        """Record a finished section."""
+        with self._progress:
+            self.sections.append((section, section_data))
+            self._progress.notify_all()
+    
+    def follow(self) -> Iterator[Tuple[str, dict]]:
+        """Yield every section, finished ones first, until the analysis is done."""
+        seen = 0
+        while True:
+            with self._progress:
+                while seen == len(self.sections) and not self.done():
+                    self._progress.wait()
+                new = self.sections[seen:]
+                finished = self.done()
+            seen += len(new)
+            yield from new
+            if finished and seen == len(self.sections):
+                return
+
+
+def claim_analysis(username: str) -> Tuple[AnalysisFuture, bool]:
+    """
+    Get the in-flight analysis of a username, registering one if there is none.
+    
+    Returns:
+        (future of the analysis, whether the caller registered it and must run it)
+    """
+    key = username.lower()
+    with inflight_lock:
+        future = inflight_analyses.get(key)
+        if future is not None:
+            return future, False
+        future = AnalysisFuture()
+        inflight_analyses[key] = future
+        return future, True
+
+
+def release_analysis(username: str, future: Future) -> None:
+    """Unregister a finished analysis so the next request starts a new one."""
+    with inflight_lock:
+        if inflight_analyses.get(username.lower()) is future:
+            del inflight_analyses[username.lower()]
+
+
+def run_claimed_analysis(username: str, future: Future, run: Callable[[], dict]) -> None:
+    """Run a claimed analysis in an analysis slot and resolve its future."""
+    try:
+        with analysis_slots:
+            future.set_result(run())
+    except BaseException as e:
+        future.set_exception(e)
+    finally:
+        release_analysis(username, future)
+
+
+def submit_analysis(username: str) -> AnalysisFuture:
+    """Analyze and save a profile on the analysis executor, joining an in-flight analysis if any."""
+    future, owner = claim_analysis(username)
+    if owner:
+        analysis_executor.submit(
+            run_claimed_analysis, username, future,
+            lambda: analyze_and_save(username, on_section=future.add_section)
+        )
+    return future
+
+
+def server_sent_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {dumps(data).decode('utf-8')}\n\n"
+
+
+def stream_analysis(username: str) -> Iterator[str]:
+    """
+    Analyze and save a GitHub profile, emitting each section as an event.
+    
+    The analysis runs on the analysis executor (shared with concurrent
+    requests for the profile) and the stream only follows its progress, so
+    a client that disconnects stops receiving events without cancelling it.
+    
+    Events:
+        section: {"section": name, "data": profile_data keys of the section}
+        done: {"status": "success", "username": username}
+        error: {"detail": message}
+    """
+    future = submit_analysis(username)
+    for section, section_data in future.follow():
+        yield server_sent_event("section", {"section": section, "data": section_data})
+    
+    error = future.exception()
+    if error is not None:
+        detail = getattr(error, "detail", None) or f"Analysis failed: {str(error)}"
+        yield server_sent_event("error", {"detail": detail})
+        return
+    yield server_sent_event("done", {"status": "success", "username": username})
+
+
+def batch_usernames(usernames: List[str]) -> List[str]:
+    """
+    Usernames of a batch request, stripped and without duplicates
+    (case-insensitive; the first spelling is kept).
+    
+    Raises:
+        HTTPException: 400 if there are none or more than BATCH_MAX_USERNAMES
+    """
+    unique = {}
+    for username in usernames:
+        username = username.strip()
+        if username:
+            unique.setdefault(username.lower(), username)
+    if not unique:
+        raise HTTPException(status_code=400, detail="No usernames given")
+    if len(unique) > BATCH_MAX_USERNAMES:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_USERNAMES} usernames per batch")
+    return list(unique.values())
+
+
+def stream_batch(usernames: List[str]) -> Iterator[str]:
+    """
+    Analyze and save several profiles, emitting each one as soon as it is done.
+    
+    Analyses take batch slots (BATCH_WORKERS across all batches). Profiles
+    that are already being analyzed are joined.
+    
+    Events:
+        profile: {"username": username, "data": profile_data}
+        error: {"username": username, "detail": message}
+        done: {"status": "success", "succeeded": count, "failed": count}
+    """
+    pending = deque(usernames)
+    finished: SimpleQueue = SimpleQueue()
+    running = 0
+    succeeded = failed = 0
+    
+    def on_done(username: str, future: Future) -> None:
+        batch_slots.release()
+        finished.put((username, future))
+    
+    while pending or running:
+        # Start analyses while slots are free; block for one only when
+        # nothing of this batch is running (otherwise wait for a result)
+        while pending and batch_slots.acquire(blocking=running == 0):
+            username = pending.popleft()
+            running += 1
+            submit_analysis(username).add_done_callback(
+                lambda future, username=username: on_done(username, future)
+            )
+        
+        username, future = finished.get()
+        running -= 1
+        error = future.exception()
+        if error is None:
+            succeeded += 1
+            yield server_sent_event("profile", {"username": username, "data": future.result()})
+        else:
+            failed += 1
+            detail = getattr(error, "detail", None) or f"Analysis failed: {str(error)}"
+            yield server_sent_event("error", {"username": username, "detail": detail})
+    
+    yield server_sent_event("done", {"status": "success", "succeeded": succeeded, "failed": failed})
+
+
+@app.on_event("startup")
+async def import_legacy_profiles():
+    """Move profiles saved as data/{username}.json into the profile store."""
+    imported = await asyncio.to_thread(profile_store.import_json, "data")
+    if imported:
+        print(f"Imported {imported} profile(s) from data/*.json")
+
+
+@app.on_event("startup")
+async def prune_charts():
+    """Delete stored charts that are no longer published."""
+    max_age_days = float(os.getenv("CHART_STORE_MAX_AGE_DAYS", 30))
+    removed = await asyncio.to_thread(prune_chart_store, chart_generator.store_dir, max_age_days)
+    if removed:
+        print(f"Pruned {removed} unused chart(s) from {chart_generator.store_dir}")
+
+
+@app.on_event("startup")
+async def start_chart_pool():
+    """
+    Spawn and warm the chart rendering processes in the background.
+    
+    Warming imports matplotlib in every worker (seconds), so it is not
+    awaited: requests are served meanwhile, and a render that comes first
+    waits for the pool in ChartRenderPool.render.
+    """
+    if chart_pool:
+        threading.Thread(target=warm_chart_pool, name="chart-pool-warmup", daemon=True).start()
+
+
+def warm_chart_pool() -> None:
+    """Start the chart pool, logging (not raising) failures."""
+    try:
+        chart_pool.start()
+    except Exception as e:
+        print(f"Warning: could not start chart workers: {e}")
+
+
+@app.on_event("shutdown")
+async def stop_chart_pool():
+    """Stop the chart rendering processes."""
+    if chart_pool:
+        chart_pool.shutdown()
+
+
+@app.on_event("startup")
+async def start_job_workers():
+    """Start the background job worker processes."""
+    global job_workers
+    job_workers = jobs.pool_from_env(job_queue)
+    if job_workers:
+        job_workers.start()
+
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    """Stop the background job worker processes."""
+    if job_workers:
+        job_workers.stop()
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -116,6 +448,10 @@ async def root():
         "description": "GitHub Profile Analyzer and Portfolio Generator",
         "endpoints": {
             "analyze": "/analyze/{username}",
+            "analyze_stream": "/analyze/{username}/stream",
+            "analyze_batch": "/analyze/batch",
+            "jobs": "/jobs/analyze",
+            "jobs_batch": "/jobs/analyze/batch",
             "data": "/data",
             "health": "/health",
             "docs": "/docs"
@@ -127,15 +463,38 @@ async def root():
 async def health_check():
     """Health check endpoint."""
     token_status = "configured" if github_token else "not configured"
+    # Health probes must not load the analyzer (see get_analyzer); until the
+    # first analysis, the configured backend is reported
+    if analyzer is not None:
+        github_backend = analyzer.backend
+        token_pool = analyzer.token_pool.status() if analyzer.token_pool else None
+    else:
+        github_backend = os.getenv("GITHUB_BACKEND", "rest").lower()
+        token_pool = None
     return {
         "status": "healthy",
         "github_token": token_status,
+        "github_backend": github_backend,
+        "token_pool": token_pool,
+        "job_workers": job_workers.status() if job_workers else None,
+        "chart_workers": chart_pool.status() if chart_pool else None,
         "api_version": "1.0.0"
     }
 
 
+def analysis_response(request: Request, username: str, profile_data: dict) -> Response:
+    """Encoded (and, if accepted, compressed) response for a finished analysis."""
+    body = dumps({
+        "status": "success",
+        "message": f"Successfully analyzed profile: {username}",
+        "data": profile_data
+    })
+    # Each analysis is a fresh result; only GET /data/{username} is cacheable
+    return json_response(request, body, cache_control="no-store")
+
+
 @app.get("/analyze/{username}")
-async def analyze_profile(username: str, background_tasks: BackgroundTasks):
+async def analyze_profile(username: str, request: Request):
     """
     Analyze a GitHub profile and generate portfolio data.
     
@@ -146,64 +505,168 @@ async def analyze_profile(username: str, background_tasks: BackgroundTasks):
         Analysis results and generated data
     """
     try:
-        # Run analysis
-        profile_data = analyze_and_save(username)
+        # Run analysis off the event loop, sharing any in-flight analysis
+        profile_data = await asyncio.wrap_future(submit_analysis(username))
         
-        return {
-            "status": "success",
-            "message": f"Successfully analyzed profile: {username}",
-            "data": profile_data
-        }
+        return analysis_response(request, username, profile_data)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/analyze/{username}/stream")
+async def analyze_profile_stream(username: str):
+    """
+    Analyze a GitHub profile, streaming each section as Server-Sent Events
+    as soon as it is ready (profile basics first, charts last).
+    
+    Args:
+        username: GitHub username to analyze
+        
+    Returns:
+        text/event-stream of section, done and error events
+    """
+    # The synchronous generator is iterated in a worker thread
+    return StreamingResponse(
+        stream_analysis(username),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.post("/analyze")
-async def analyze_profile_post(request: AnalyzeRequest):
+async def analyze_profile_post(body: AnalyzeRequest, request: Request):
     """
     Analyze a GitHub profile (POST method).
     
     Args:
-        request: Request body containing username
+        body: Request body containing username
         
     Returns:
         Analysis results
     """
     try:
-        profile_data = analyze_and_save(request.username)
+        profile_data = await asyncio.wrap_future(submit_analysis(body.username))
         
-        return {
-            "status": "success",
-            "message": f"Successfully analyzed profile: {request.username}",
-            "data": profile_data
-        }
+        return analysis_response(request, body.username, profile_data)
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/analyze/batch")
+async def analyze_batch(body: AnalyzeBatchRequest):
+    """
+    Analyze several GitHub profiles (e.g. a team), streaming each profile
+    as a Server-Sent Event as soon as it is ready.
+    
+    Args:
+        body: Usernames to analyze (at most BATCH_MAX_USERNAMES)
+        
+    Returns:
+        text/event-stream of profile and error events (one per username),
+        then a done event
+    """
+    usernames = batch_usernames(body.usernames)
+    # The synchronous generator is iterated in a worker thread
+    return StreamingResponse(
+        stream_batch(usernames),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/jobs/analyze", status_code=202)
+async def create_analyze_job(request: AnalyzeJobRequest):
+    """
+    Queue a background analysis of a GitHub profile.
+    
+    Requests for a profile that is already queued or running join that job.
+    
+    Args:
+        request: Username and priority (higher runs first)
+        
+    Returns:
+        Job id and status
+    """
+    try:
+        job_id = await asyncio.to_thread(job_queue.enqueue, request.username, request.priority)
+        job = await asyncio.to_thread(job_queue.get, job_id)
+        return {"job_id": job_id, "status": job["status"]}
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def enqueue_batch(usernames: List[str], priority: int) -> List[Dict]:
+    """Queue (or join) one analysis job per username."""
+    queued = []
+    for username in usernames:
+        job_id = job_queue.enqueue(username, priority)
+        queued.append({"username": username, "job_id": job_id, "status": job_queue.get(job_id)["status"]})
+    return queued
+
+
+@app.post("/jobs/analyze/batch", status_code=202)
+async def create_analyze_batch_jobs(request: AnalyzeBatchJobRequest):
+    """
+    Queue background analyses of several GitHub profiles.
+    
+    Each profile gets its own job (joining an unfinished one), whose
+    status is read with GET /jobs/{job_id}.
+    
+    Args:
+        request: Usernames and priority (higher runs first)
+        
+    Returns:
+        Job id and status per username
+    """
+    usernames = batch_usernames(request.usernames)
+    try:
+        return {"jobs": await asyncio.to_thread(enqueue_batch, usernames, request.priority)}
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Get the status and progress of a background job.
+    
+    Args:
+        job_id: Id returned by POST /jobs/analyze
+        
+    Returns:
+        Job status, progress (last finished section), attempts and error
+    """
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
 @app.get("/data")
-async def get_data():
+async def get_data(request: Request):
     """
     Get the latest analyzed profile data.
     
     Returns:
-        Latest profile.json data
+        Most recently analyzed profile
     """
     try:
-        data_file = "data/profile.json"
+        # The profile store blocks on SQLite, so it is read off the event loop
+        username = await asyncio.to_thread(profile_store.latest)
+        stored = await asyncio.to_thread(profile_store.payload, username) if username else None
         
-        if not os.path.exists(data_file):
+        if stored is None:
             raise HTTPException(
                 status_code=404,
                 detail="No profile data found. Please analyze a profile first."
             )
         
-        with open(data_file, 'r') as f:
-            data = json.load(f)
-        
-        return data
+        payload, etag = stored
+        return json_response(request, payload, etag)
         
     except HTTPException:
         raise
@@ -211,11 +674,25 @@ async def get_data():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def refresh_in_background(username: str) -> None:
+    """Start one background re-analysis of a profile (joining any in flight)."""
+    if job_workers:
+        job_queue.enqueue(username)
+    else:
+        submit_analysis(username)
+
+
 @app.get("/data/{username}")
-async def get_user_data(username: str, force_refresh: bool = False):
+async def get_user_data(username: str, request: Request, force_refresh: bool = False):
     """
     Get data for a specific user (if stored).
     
+    Profiles older than the soft TTL are returned immediately with
+    `"stale": true` while one background refresh is started; profiles older
+    than the hard TTL are treated as missing. Responses carry `Age` and
+    `X-Analyzed-At` headers and a strong ETag (If-None-Match returns 304),
+    and are served from the stored encoding, compressed when accepted.
+    
     Args:
         username: GitHub username
         force_refresh: Force re-analysis even if cached data exists
@@ -224,45 +701,39 @@ async def get_user_data(username: str, force_refresh: bool = False):
         User's profile data or 404 if not found/expired
     """
     try:
-        # Check if we have this user's data
-        data_file = f"data/{username}.json"
+        # Freshness is checked on the index, without reading the profile (the
+        # store blocks on SQLite, so it is read off the event loop)
+        meta = await asyncio.to_thread(profile_store.meta, username)
         
-        if os.path.exists(data_file) and not force_refresh:
-            with open(data_file, 'r') as f:
-                data = json.load(f)
+        if meta and not force_refresh:
+            age = timedelta(0)
+            if meta["analyzed_at"]:
+                analyzed_time = datetime.fromisoformat(meta["analyzed_at"])
+                age = datetime.now(timezone.utc) - analyzed_time
                 
-                # Check if data is older than 24 hours
-                if "analyzed_at" in data:
-                    analyzed_time = datetime.fromisoformat(data["analyzed_at"])
-                    now = datetime.now(timezone.utc)
-                    age = now - analyzed_time
-                    
-                    # If data is fresh (< 24 hours), return it
-                    if age < timedelta(hours=24):
-                        return data
-                    else:
-                        # Data is stale, trigger 404 to force re-analysis
-                        raise HTTPException(
-                            status_code=404,
-                            detail=f"Cached data expired for user: {username}"
-                        )
+                # Too old to serve, trigger 404 to force re-analysis
+                if age >= PROFILE_HARD_TTL:
+                    raise HTTPException(
+                        status_code=404,
+                        detail=f"Cached data expired for user: {username}"
+                    )
+            
+            stored = await asyncio.to_thread(profile_store.payload, username)
+            if stored is not None:
+                payload, etag = stored
+                headers = {"Age": str(max(0, int(age.total_seconds())))}
+                if meta["analyzed_at"]:
+                    headers["X-Analyzed-At"] = meta["analyzed_at"]
                 
-                return data
-        
-        # If not found, return the default profile.json if it matches
-        default_file = "data/profile.json"
-        if os.path.exists(default_file) and not force_refresh:
-            with open(default_file, 'r') as f:
-                data = json.load(f)
-                if data.get("username") == username:
-                    # Check age for default file too
-                    if "analyzed_at" in data:
-                        analyzed_time = datetime.fromisoformat(data["analyzed_at"])
-                        now = datetime.now(timezone.utc)
-                        age = now - analyzed_time
-                        
-                        if age < timedelta(hours=24):
-                            return data
+                if age >= PROFILE_SOFT_TTL:
+                    # Serve stale data now, refresh for the next visitor (the
+                    # job queue write can wait on SQLite, so off the event loop)
+                    await asyncio.to_thread(refresh_in_background, username)
+                    # Add "stale": true to the encoded object without re-encoding it
+                    payload = payload[:-1] + b',"stale":true}'
+                    etag = etag[:-1] + '-stale"'
+                
+                return json_response(request, payload, etag, headers=headers)
         
         raise HTTPException(
             status_code=404,
@@ -275,33 +746,90 @@ async def get_user_data(username: str, force_refresh: bool = False):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/charts/{username}/{chart}.json")
+async def get_chart_spec(username: str, chart: str, request: Request):
+    """
+    Get the data and declarative spec of a chart, for drawing it client-side.
+    
+    Args:
+        username: GitHub username
+        chart: Chart name (languages, stars or contributions)
+        
+    Returns:
+        Chart spec JSON (with a strong ETag; If-None-Match returns 304)
+    """
+    stored = await asyncio.to_thread(profile_store.payload, username)
+    if stored is None:
+        raise HTTPException(status_code=404, detail=f"No data found for user: {username}")
+    
+    # The spec only changes with the profile (or the spec format)
+    etag = stored[1][:-1] + f"-{chart}-v{CHART_SPEC_VERSION}" + '"'
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    
+    spec = chart_spec(chart, await asyncio.to_thread(profile_store.get, username))
+    if spec is None:
+        raise HTTPException(status_code=404, detail="Chart not found")
+    
+    return json_response(request, dumps(spec), etag)
+
+
 @app.get("/charts/{username}/{chart_name}")
-async def get_chart(username: str, chart_name: str):
+async def get_chart(username: str, chart_name: str, request: Request, w: Optional[int] = None):
     """
     Get a specific chart image for a user.
     
+    For a chart's canonical name (as listed in the profile), the best
+    derivative is served: WebP, PNG or SVG from the Accept header, at 1x
+    when `w` (the pixel width to display) fits it, otherwise 2x. Derivative
+    names can also be requested directly.
+    
+    Content-hashed chart URLs never change content, so they are served as
+    immutable; every chart has a strong ETag and honours If-None-Match.
+    
     Args:
         username: GitHub username
         chart_name: Name of the chart file
+        w: Display width in pixels
         
     Returns:
-        Chart image file
+        Chart image file, or 304 if the client's copy is current
     """
+    # Dotfiles are the folder's version manifest and lock
+    if ".." in username or ".." in chart_name or chart_name.startswith("."):
+        raise HTTPException(status_code=404, detail="Chart not found")
+    
     chart_path = os.path.join("charts", username, chart_name)
     
     if not os.path.exists(chart_path):
         raise HTTPException(status_code=404, detail="Chart not found")
     
-    return FileResponse(chart_path)
+    headers = {}
+    match = CHART_VERSION_RE.match(chart_name)
+    if match:
+        cache_control = "public, max-age=31536000, immutable"
+        if match.group("ext") == "png" and not match.group("scale"):
+            chart_path = negotiate_chart(chart_path, request.headers.get("accept", ""), w)
+            headers["Vary"] = "Accept"
+    else:
+        # Unversioned name: cacheable, but revalidated on every use
+        cache_control = "no-cache"
+    etag = chart_etag(chart_path)
+    headers.update({"ETag": etag, "Cache-Control": cache_control})
+    
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    ext = os.path.splitext(chart_path)[1][1:]
+    return FileResponse(chart_path, headers=headers, media_type=CHART_MEDIA_TYPES.get(ext))
 
 
 @app.delete("/data")
 async def clear_data():
     """Clear all stored profile data and charts."""
     try:
-        # Clear JSON data
-        if os.path.exists("data/profile.json"):
-            os.remove("data/profile.json")
+        # Clear profile data
+        await asyncio.to_thread(profile_store.clear)
         
         # Clear charts
         for file in os.listdir("charts"):
@@ -319,5 +847,6 @@ async def clear_data():
 
 
 if __name__ == "__main__":
+    import uvicorn
     port = int(os.getenv("PORT", 8000))
     uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from graphql_backend import GraphQLClient, GraphQLError
+
+
+NAMES_QUERY = """
+query($ids: [ID!]!) {
+  nodes(ids: $ids) {
+    ... on User { login name }
+    ... on Organization { login name }
+    ... on Bot { login }
+  }
+}
+"""
+
+# Maximum IDs the GraphQL `nodes` field accepts per query
+MAX_BATCH_SIZE = 100
+
+
+class PersonDirectory:
+    """
+    Shared login -> display name directory.
+
+    Reading `name` on the users returned by collaborator and contributor
+    listings makes PyGithub fetch /users/{login} once per person. Instead,
+    stages record only logins and node IDs, and the directory resolves the
+    names of everyone still unknown in a few GraphQL `nodes(ids:)` queries.
+    Names are kept for `ttl` seconds and shared across repositories and
+    analyses; the least recently used entries are evicted past max_entries.
+    """
+
+    def __init__(self, client: Optional[GraphQLClient] = None, ttl: int = 86400,
+                 max_entries: int = 10000):
+        """
+        Initialize an empty directory.
+
+        Args:
+            client: GraphQL client; without one names are never resolved
+            ttl: Seconds a resolved name is reused
+            max_entries: Maximum names kept
+        """
+        self.client = client
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._names: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, login: str) -> Optional[str]:
+        """Cached display name of login, or None if unknown or expired."""
+        with self._lock:
+            entry = self._names.get(login)
+            if entry is None:
+                return None
+            name, expires_at = entry
+            if time.time() >= expires_at:
+                del self._names[login]
+                return None
+            self._names.move_to_end(login)
+            return name
+
+    def put(self, login: str, name: str) -> None:
+        """Record the display name of login."""
+        with self._lock:
+            self._names[login] = (name, time.time() + self.ttl)
+            self._names.move_to_end(login)
+            while len(self._names) > self.max_entries:
+                self._names.popitem(last=False)
+
+    def resolve(self, node_ids: Dict[str, str]) -> Dict[str, str]:
+        """
+        Display names of people, resolving unknown ones in batches.
+
+        Args:
+            node_ids: login -> GraphQL node ID
+
+        Returns:
+            login -> display name (the login when no name is set or it
+            could not be resolved)
+        """
+        names = {}
+        missing = {}
+        for login, node_id in node_ids.items():
+            name = self.get(login)
+            if name is not None:
+                names[login] = name
+            elif node_id:
+                missing[login] = node_id
+
+        if self.client and missing:
+            ids = list(missing.values())
+            for start in range(0, len(ids), MAX_BATCH_SIZE):
+                try:
+                    # Unresolvable IDs (deleted or ghost accounts) come back as
+                    # null nodes with errors; the others are still named
+                    data = self.client.query(NAMES_QUERY, {"ids": ids[start:start + MAX_BATCH_SIZE]},
+                                             allow_partial=True)
+                except (GraphQLError, OSError, ValueError) as e:
+                    print(f"Warning: could not resolve names: {e}")
+                    continue
+                for node in data.get("nodes") or []:
+                    if node and node.get("login"):
+                        self.put(node["login"], node.get("name") or node["login"])
+                        names[node["login"]] = node.get("name") or node["login"]
+
+        for login in node_ids:
+            names.setdefault(login, login)
+        return names
+
+
+def directory_from_env(client: Optional[GraphQLClient]) -> Optional[PersonDirectory]:
+    """
+    Person directory as configured by PERSON_NAMES ("batch" or "off") and
+    PERSON_DIRECTORY_TTL_HOURS.
+
+    Returns:
+        PersonDirectory, or None when names are not resolved
+    """
+    if os.getenv("PERSON_NAMES", "batch").lower() == "off" or client is None:
+        return None
+    return PersonDirectory(client, ttl=int(float(os.getenv("PERSON_DIRECTORY_TTL_HOURS", 24)) * 3600))
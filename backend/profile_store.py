@@ -0,0 +1,269 @@
+import glob
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from http_responses import dumps, loads, strong_etag
+
+
+class ProfileStore:
+    """
+    Two-tier store of analyzed profiles.
+
+    Profiles are persisted in SQLite next to an index of username ->
+    analyzed_at, size and etag, so freshness checks never read the payload.
+    Profiles are stored as compact JSON and kept in a size-bounded
+    in-process LRU as those bytes, so responses can be served straight from
+    memory without re-encoding; the parsed dict is only built (once) for
+    callers that need it.
+
+    Profiles written by other processes (job workers) are detected with
+    PRAGMA data_version: after another connection commits, cached entries
+    are revalidated against the index etag before they are served again,
+    and the index (kept in memory too) is reloaded.
+
+    Writes go through their own connection and lock, so a commit waiting
+    for another process's write lock never blocks readers. All methods do
+    blocking I/O; async callers run them in a thread.
+    """
+
+    def __init__(self, path: str, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite file path
+            max_entries: Most profiles kept in memory
+            max_bytes: Most serialized bytes kept in memory
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._write_conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._write_conn.execute("PRAGMA journal_mode=WAL")
+        self._write_conn.execute("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                key TEXT PRIMARY KEY,
+                username TEXT NOT NULL,
+                analyzed_at TEXT,
+                size INTEGER NOT NULL,
+                etag TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                payload BLOB NOT NULL
+            )
+        """)
+        self._write_conn.execute("CREATE INDEX IF NOT EXISTS profiles_analyzed_at ON profiles (analyzed_at)")
+        self._write_conn.commit()
+        # Readers (WAL) never wait for writers
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+
+        # key -> [etag, payload, parsed profile or None, generation it was last validated in]
+        self._memory: "OrderedDict[str, list]" = OrderedDict()
+        self._memory_bytes = 0
+        self._generation = 0
+        self._data_version = self._read_data_version()
+        # key -> index entry, as of _index_generation
+        self._index: Dict[str, Dict] = {}
+        self._index_generation = -1
+
+    @staticmethod
+    def _key(username: str) -> str:
+        return username.lower()
+
+    def _read_data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _check_external_writes(self) -> None:
+        """Start a new validation generation if another connection has committed."""
+        version = self._read_data_version()
+        if version != self._data_version:
+            self._data_version = version
+            self._generation += 1
+
+    def _current_index(self) -> Dict[str, Dict]:
+        """Index of all profiles, reloaded after external writes (lock held)."""
+        self._check_external_writes()
+        if self._index_generation != self._generation:
+            rows = self._conn.execute(
+                "SELECT key, username, analyzed_at, size, etag, stored_at FROM profiles"
+            ).fetchall()
+            self._index = {
+                row[0]: {"username": row[1], "analyzed_at": row[2], "size": row[3], "etag": row[4], "stored_at": row[5]}
+                for row in rows
+            }
+            self._index_generation = self._generation
+        return self._index
+
+    def _remember(self, key: str, etag: str, payload: bytes, profile: Optional[Dict]) -> List:
+        self._forget(key)
+        entry = [etag, payload, profile, self._generation]
+        self._memory[key] = entry
+        self._memory_bytes += len(payload)
+        while self._memory and (len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes):
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted[1])
+        return entry
+
+    def _forget(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry:
+            self._memory_bytes -= len(entry[1])
+
+    def _entry(self, key: str) -> Optional[List]:
+        """Current cache entry of key, loading it from disk if needed (lock held)."""
+        self._check_external_writes()
+        entry = self._memory.get(key)
+        if entry:
+            if entry[3] == self._generation:
+                self._memory.move_to_end(key)
+                return entry
+            # Another process has written since; still current if the etag matches
+            row = self._conn.execute("SELECT etag FROM profiles WHERE key = ?", (key,)).fetchone()
+            if row and row[0] == entry[0]:
+                entry[3] = self._generation
+                self._memory.move_to_end(key)
+                return entry
+            self._forget(key)
+
+        row = self._conn.execute("SELECT etag, payload FROM profiles WHERE key = ?", (key,)).fetchone()
+        if not row:
+            return None
+        return self._remember(key, row[0], bytes(row[1]), None)
+
+    def meta(self, username: str) -> Optional[Dict]:
+        """Index entry of a profile (username, analyzed_at, size, etag, stored_at), or None."""
+        with self._lock:
+            meta = self._current_index().get(self._key(username))
+        return dict(meta) if meta else None
+
+    def get(self, username: str) -> Optional[Dict]:
+        """
+        Parsed profile, or None if not stored.
+
+        The returned dict is shared with the cache and must not be mutated.
+        """
+        with self._lock:
+            entry = self._entry(self._key(username))
+            if not entry:
+                return None
+            if entry[2] is None:
+                entry[2] = loads(entry[1])
+            return entry[2]
+
+    def payload(self, username: str) -> Optional[Tuple[bytes, str]]:
+        """
+        Compact JSON encoding of a profile and its etag, without parsing it.
+
+        Returns:
+            (payload, etag), or None if not stored
+        """
+        with self._lock:
+            entry = self._entry(self._key(username))
+            return (entry[1], entry[0]) if entry else None
+
+    def put(self, username: str, profile: Dict) -> Dict:
+        """
+        Store a profile.
+
+        Returns:
+            Its index entry
+        """
+        payload = dumps(profile)
+        etag = strong_etag(payload)
+        key = self._key(username)
+        meta = {
+            "username": username,
+            "analyzed_at": profile.get("analyzed_at"),
+            "size": len(payload),
+            "etag": etag,
+            "stored_at": time.time()
+        }
+        with self._write_lock:
+            # Readers are not blocked while the commit waits for SQLite
+            self._write_conn.execute(
+                "INSERT OR REPLACE INTO profiles VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, username, meta["analyzed_at"], meta["size"], etag, meta["stored_at"], payload)
+            )
+            self._write_conn.commit()
+            with self._lock:
+                # The commit is seen as a new data_version like any other
+                self._current_index()[key] = dict(meta)
+                self._remember(key, etag, payload, profile)
+        return meta
+
+    def latest(self) -> Optional[str]:
+        """Username of the most recently analyzed profile, or None."""
+        with self._lock:
+            index = self._current_index()
+            if not index:
+                return None
+            return max(index.values(), key=lambda meta: meta["analyzed_at"] or "")["username"]
+
+    def delete(self, username: str) -> None:
+        """Remove a profile."""
+        key = self._key(username)
+        with self._write_lock:
+            self._write_conn.execute("DELETE FROM profiles WHERE key = ?", (key,))
+            self._write_conn.commit()
+            with self._lock:
+                self._current_index().pop(key, None)
+                self._forget(key)
+
+    def clear(self) -> None:
+        """Remove every profile."""
+        with self._write_lock:
+            self._write_conn.execute("DELETE FROM profiles")
+            self._write_conn.commit()
+            with self._lock:
+                self._current_index().clear()
+                self._memory.clear()
+                self._memory_bytes = 0
+
+    def import_json(self, directory: str) -> int:
+        """
+        Import legacy data/{username}.json files, unless the stored profile
+        is newer (the old data/profile.json is skipped). Imported files are
+        renamed to *.json.imported so they are not imported again.
+
+        Returns:
+            Number of profiles imported
+        """
+        imported = 0
+        for path in glob.glob(os.path.join(directory, "*.json")):
+            if os.path.basename(path) == "profile.json":
+                continue
+            try:
+                with open(path, 'r') as f:
+                    profile = json.load(f)
+            except (OSError, ValueError):
+                continue
+            username = profile.get("username") or os.path.splitext(os.path.basename(path))[0]
+            meta = self.meta(username)
+            if not meta or (meta["analyzed_at"] or "") < (profile.get("analyzed_at") or ""):
+                self.put(username, profile)
+                imported += 1
+            try:
+                os.replace(path, path + ".imported")
+            except FileNotFoundError:
+                # Another worker process imported it at the same time
+                pass
+        return imported
+
+
+def store_from_env() -> ProfileStore:
+    """Profile store as configured by PROFILE_DB, PROFILE_CACHE_ENTRIES and PROFILE_CACHE_MB."""
+    return ProfileStore(
+        os.getenv("PROFILE_DB", "data/profiles.sqlite3"),
+        max_entries=int(os.getenv("PROFILE_CACHE_ENTRIES", 256)),
+        max_bytes=int(float(os.getenv("PROFILE_CACHE_MB", 64)) * 1024 * 1024)
+    )
@@ -0,0 +1,152 @@
+import os
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# Stages that fan out per repository, in priority order (most important first)
+STAGE_PRIORITY = ["languages", "commits", "collaborators", "collaboration", "activity"]
+
+# Estimated REST calls per repository for each stage
+STAGE_COST = {
+    "languages": 1,       # get_languages
+    "commits": 1,         # get_commits(author=...).totalCount
+    "collaborators": 2,   # get_collaborators + get_contributors
+    "collaboration": 8,   # issues, pulls, up to 5 reviews, collaborators/contributors when owned
+    "activity": 1,        # /stats/punch_card
+}
+
+# Repositories every stage gets before any stage is expanded further
+MIN_SAMPLE = 5
+
+
+class RequestBudget:
+    """
+    Per-analysis call budget. Each stage asks `select` which repositories
+    it may analyze, and the budget records what was sampled so results can
+    be flagged as complete or partial.
+    """
+
+    def __init__(self, limits: Dict[str, Optional[int]], remaining: Optional[int] = None,
+                 reset_at: Optional[datetime] = None, is_free: Optional[Callable] = None,
+                 spare: Optional[int] = None):
+        """
+        Initialize the budget.
+
+        Args:
+            limits: Stage -> maximum repositories that cost calls (None = unlimited)
+            remaining: Rate limit remaining when the budget was planned
+            reset_at: When the rate limit window resets
+            is_free: Predicate (stage, repo) for repositories that cost a stage no
+                calls (e.g. its data is in the last snapshot); they are always selected
+            spare: Calls no stage was given (None = unknown)
+        """
+        self.limits = limits
+        self.is_free = is_free
+        self.remaining = remaining
+        self.reset_at = reset_at
+        self.spare = spare
+        self._coverage: Dict[str, Dict] = {}
+
+    def replan(self, stage: str, cost: int) -> None:
+        """
+        Re-limit a stage that turns out to cost `cost` calls per repository
+        although it was planned as free (e.g. the per-repository fallback of
+        a failed commit search), so it only spends the spare calls.
+        """
+        if self.spare is None or cost <= 0:
+            return
+        limit = self.spare // cost
+        self.limits[stage] = limit
+        self.spare -= limit * cost
+
+    def select(self, stage: str, repos: List) -> List:
+        """
+        Pick the repositories a stage may analyze.
+
+        When sampling, the most recently pushed repositories are kept and
+        returned in their original order.
+        """
+        limit = self.limits.get(stage)
+        selected = repos
+        paid = [i for i, repo in enumerate(repos) if not (self.is_free and self.is_free(stage, repo))]
+        if limit is not None and len(paid) > limit:
+            dropped = set(sorted(
+                paid,
+                key=lambda i: _activity_date(repos[i]),
+                reverse=True
+            )[limit:])
+            selected = [repo for i, repo in enumerate(repos) if i not in dropped]
+
+        self._coverage[stage] = {
+            "analyzed": len(selected),
+            "total": len(repos),
+            "complete": len(selected) == len(repos)
+        }
+        return selected
+
+    def coverage(self) -> Dict:
+        """Summary of what was analyzed, for profile_data."""
+        return {
+            "complete": all(stage["complete"] for stage in self._coverage.values()),
+            "rate_limit_remaining": self.remaining,
+            "rate_limit_reset": self.reset_at.isoformat() if self.reset_at else None,
+            "stages": dict(self._coverage)
+        }
+
+
+def _activity_date(repo) -> datetime:
+    """Most recent push (or update) of a repository, for sampling."""
+    date = getattr(repo, "pushed_at", None) or repo.updated_at
+    return date or datetime.min.replace(tzinfo=timezone.utc)
+
+
+def plan_budget(remaining: int, demands: Dict[str, Tuple[int, int]],
+                reset_at: Optional[datetime] = None, reserve: Optional[int] = None,
+                is_free: Optional[Callable] = None) -> RequestBudget:
+    """
+    Split the remaining rate limit between stages by priority.
+
+    Every stage first gets up to MIN_SAMPLE repositories, then stages are
+    expanded to all of their repositories in priority order while calls
+    remain. With a fresh token nothing is sampled.
+
+    Args:
+        remaining: Calls left in the current rate limit window
+        demands: Stage -> (repositories that cost calls, calls per repository)
+        reset_at: When the rate limit window resets
+        reserve: Calls to keep unused (defaults to GITHUB_BUDGET_RESERVE)
+        is_free: Predicate (stage, repo) for repositories that cost a stage no calls
+
+    Returns:
+        RequestBudget with a repository limit per stage
+    """
+    if reserve is None:
+        reserve = int(os.getenv("GITHUB_BUDGET_RESERVE", 20))
+    available = max(0, remaining - reserve)
+
+    total_cost = sum(count * cost for count, cost in demands.values())
+    if total_cost <= available:
+        return RequestBudget({stage: None for stage in demands}, remaining, reset_at, is_free,
+                             spare=available - total_cost)
+
+    stages = sorted(demands, key=lambda s: STAGE_PRIORITY.index(s) if s in STAGE_PRIORITY else len(STAGE_PRIORITY))
+    limits = {stage: 0 for stage in stages}
+
+    # First pass: a small sample for every stage; second pass: expand by priority
+    for target in (lambda count: min(count, MIN_SAMPLE), lambda count: count):
+        for stage in stages:
+            count, cost = demands[stage]
+            wanted = target(count) - limits[stage]
+            if wanted <= 0:
+                continue
+            affordable = wanted if cost == 0 else min(wanted, available // cost)
+            limits[stage] += affordable
+            available -= affordable * cost
+
+    return RequestBudget(
+        {stage: (None if limits[stage] >= demands[stage][0] else limits[stage]) for stage in stages},
+        remaining,
+        reset_at,
+        is_free,
+        spare=available
+    )
@@ -0,0 +1,127 @@
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+
+# Bump when the shape of derived per-repo data changes
+SNAPSHOT_VERSION = 2
+
+
+def _stamp(value: Optional[datetime]) -> Optional[str]:
+    """Serialize a repo timestamp for comparison."""
+    return value.isoformat() if value else None
+
+
+class RepoSnapshot:
+    """
+    Derived per-repo data of one user's previous analysis.
+
+    A repository whose pushed_at/updated_at have not moved since the
+    snapshot was taken (and whose entry is not older than max_age) is
+    reused as-is; everything else is recomputed and recorded.
+    """
+
+    def __init__(self, entries: Dict[str, Dict], repos: List, max_age: timedelta):
+        """
+        Initialize the snapshot against the current repository listing.
+
+        Args:
+            entries: Previous snapshot entries, full_name -> entry
+            repos: Repositories as listed for this analysis
+            max_age: Entries older than this are refreshed even if unchanged
+        """
+        self._lock = threading.Lock()
+        self._current: Dict[str, Dict] = {}
+        self._fresh = set()
+        now = datetime.now(timezone.utc)
+
+        for repo in repos:
+            entry = entries.get(repo.full_name)
+            if (
+                entry
+                and entry.get("pushed_at") == _stamp(getattr(repo, "pushed_at", None))
+                and entry.get("updated_at") == _stamp(repo.updated_at)
+                and now - datetime.fromisoformat(entry["taken_at"]) < max_age
+            ):
+                self._fresh.add(repo.full_name)
+                # Carry unchanged repos over; deleted repos are dropped
+                self._current[repo.full_name] = entry
+            else:
+                self._current[repo.full_name] = {
+                    "pushed_at": _stamp(getattr(repo, "pushed_at", None)),
+                    "updated_at": _stamp(repo.updated_at),
+                    "taken_at": now.isoformat(),
+                    "data": {}
+                }
+
+        self.reused = set()
+
+    def is_fresh(self, repo) -> bool:
+        """Whether repo is unchanged since the previous analysis."""
+        return repo.full_name in self._fresh
+
+    def has(self, kind: str, repo) -> bool:
+        """Whether data of kind is stored for an unchanged repo."""
+        return self.is_fresh(repo) and self._current[repo.full_name]["data"].get(kind) is not None
+
+    def get(self, kind: str, repo) -> Any:
+        """Stored data of kind for an unchanged repo, or None."""
+        if not self.is_fresh(repo):
+            return None
+        value = self._current[repo.full_name]["data"].get(kind)
+        if value is not None:
+            with self._lock:
+                self.reused.add(repo.full_name)
+        return value
+
+    def put(self, kind: str, repo, value: Any) -> None:
+        """Record freshly derived data of kind for repo."""
+        with self._lock:
+            entry = self._current.get(repo.full_name)
+            if entry is not None:
+                entry["data"][kind] = value
+
+    def entries(self) -> Dict[str, Dict]:
+        """Entries to persist."""
+        return self._current
+
+
+class RepoSnapshotStore:
+    """Persists a RepoSnapshot per user as JSON under a directory."""
+
+    def __init__(self, directory: str, max_age_days: int = 7):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Where snapshots are written
+            max_age_days: Refresh unchanged repos after this many days
+        """
+        self.directory = directory
+        self.max_age = timedelta(days=max_age_days)
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, username: str) -> str:
+        return os.path.join(self.directory, f"{username.lower()}.json")
+
+    def load(self, username: str, repos: List) -> RepoSnapshot:
+        """Load the user's snapshot, matched against the current repo listing."""
+        entries = {}
+        try:
+            with open(self._path(username), 'r') as f:
+                stored = json.load(f)
+            if stored.get("version") == SNAPSHOT_VERSION:
+                entries = stored.get("repos", {})
+        except (OSError, ValueError):
+            pass
+        return RepoSnapshot(entries, repos, self.max_age)
+
+    def save(self, username: str, snapshot: RepoSnapshot) -> None:
+        """Write the snapshot atomically."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, 'w') as f:
+            json.dump({"version": SNAPSHOT_VERSION, "repos": snapshot.entries()}, f)
+        os.replace(tmp_path, self._path(username))
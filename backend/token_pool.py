@@ -0,0 +1,245 @@
+import os
+import threading
+import time
+from datetime import timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from github import Auth, GithubIntegration
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+
+
+# Seconds to rest a token after a secondary rate limit without Retry-After
+SECONDARY_LIMIT_COOLDOWN = 60
+
+
+class PooledToken:
+    """A credential in the pool and its last known rate-limit state per resource."""
+
+    def __init__(self, label: str, token: Optional[str] = None,
+                 provider: Optional[Callable[[], Tuple[str, float]]] = None):
+        """
+        Initialize the pooled token.
+
+        Args:
+            label: Name used in logs and status output (never the token itself)
+            token: Static token (personal access token)
+            provider: Returns (token, expires_at_epoch) for short-lived tokens
+                such as GitHub App installation tokens
+        """
+        self.label = label
+        self._token = token
+        self._provider = provider
+        self._expires_at = float("inf") if token else 0.0
+        # resource -> {"remaining", "limit", "reset", "blocked_until"}
+        self.state: Dict[str, Dict] = {}
+
+    @property
+    def token(self) -> str:
+        """Current token value, refreshing short-lived tokens shortly before expiry."""
+        if self._provider and time.time() > self._expires_at - 60:
+            self._token, self._expires_at = self._provider()
+        return self._token
+
+    def remaining(self, resource: str) -> int:
+        """Calls left for resource; unknown state counts as fresh."""
+        state = self.state.get(resource)
+        if not state:
+            return 5000
+        if state["reset"] and time.time() >= state["reset"]:
+            return state["limit"]
+        return state["remaining"]
+
+    def available(self, resource: str) -> bool:
+        """Whether the token can currently be used for resource."""
+        state = self.state.get(resource)
+        if state and time.time() < state.get("blocked_until", 0):
+            return False
+        return self.remaining(resource) > 0
+
+
+class TokenPool:
+    """
+    Pool of GitHub credentials. Each request is routed to the token with
+    the most remaining quota for its resource (core, search, graphql), and
+    tokens that hit a primary or secondary rate limit are rested until
+    they recover.
+    """
+
+    def __init__(self, tokens: List[PooledToken]):
+        """Initialize the pool with at least one token."""
+        if not tokens:
+            raise ValueError("TokenPool needs at least one token")
+        self.tokens = tokens
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def acquire(self, resource: str, exclude: Tuple[PooledToken, ...] = ()) -> Optional[PooledToken]:
+        """Least-loaded available token for resource, or None if all are limited."""
+        with self._lock:
+            candidates = [
+                t for t in self.tokens
+                if t not in exclude and t.available(resource)
+            ]
+            if not candidates:
+                return None
+            return max(candidates, key=lambda t: t.remaining(resource))
+
+    def observe(self, token: PooledToken, resource: str, response: Response) -> bool:
+        """
+        Record a response's rate-limit headers.
+
+        Returns:
+            True if the token hit a rate limit and the request should be retried elsewhere
+        """
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource", resource)
+
+        with self._lock:
+            state = token.state.setdefault(resource, {
+                "remaining": 5000, "limit": 5000, "reset": 0, "blocked_until": 0
+            })
+            if "X-RateLimit-Remaining" in headers:
+                state["remaining"] = int(headers["X-RateLimit-Remaining"])
+                state["limit"] = int(headers.get("X-RateLimit-Limit", state["limit"]))
+                state["reset"] = int(headers.get("X-RateLimit-Reset", 0))
+
+            if response.status_code not in (403, 429):
+                return False
+
+            if headers.get("Retry-After"):
+                # Secondary (abuse) limit
+                state["blocked_until"] = time.time() + int(headers["Retry-After"])
+                return True
+            if state["remaining"] == 0:
+                # Primary limit, rest until the window resets
+                state["blocked_until"] = state["reset"]
+                return True
+            if b"secondary rate limit" in (response.content or b"").lower():
+                state["blocked_until"] = time.time() + SECONDARY_LIMIT_COOLDOWN
+                return True
+            return False
+
+    def total_remaining(self, resource: str = "core") -> int:
+        """Calls left across every available token."""
+        with self._lock:
+            return sum(t.remaining(resource) for t in self.tokens if t.available(resource))
+
+    def status(self) -> List[Dict]:
+        """Per-token quota summary, safe to expose (no secrets)."""
+        with self._lock:
+            return [
+                {
+                    "label": t.label,
+                    "core_remaining": t.remaining("core"),
+                    "graphql_remaining": t.remaining("graphql"),
+                    "available": t.available("core")
+                }
+                for t in self.tokens
+            ]
+
+
+def request_resource(request: PreparedRequest) -> str:
+    """GitHub rate-limit resource a request is charged against."""
+    path = request.path_url
+    if path.startswith("/graphql") or path.startswith("/api/graphql"):
+        return "graphql"
+    if path.startswith("/search/") or "/api/v3/search/" in path:
+        return "search"
+    return "core"
+
+
+class TokenPoolAdapter(BaseAdapter):
+    """
+    Transport adapter that rewrites the Authorization header of every
+    request to the least-loaded token in the pool and retries on another
+    token when one is rate limited. App JWT requests (used to mint
+    installation tokens) are passed through untouched.
+    """
+
+    def __init__(self, inner: BaseAdapter, pool: TokenPool):
+        """Wrap inner, routing its requests over pool."""
+        super().__init__()
+        self.inner = inner
+        self.pool = pool
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        """Send request with the best token, failing over on rate limits."""
+        authorization = request.headers.get("Authorization", "")
+        scheme, _, credential = authorization.partition(" ")
+        if credential.startswith("eyJ"):
+            # A JWT: GitHub App authentication, not a pooled token
+            return self.inner.send(request, **kwargs)
+
+        resource = request_resource(request)
+        tried: Tuple[PooledToken, ...] = ()
+        response = None
+
+        while True:
+            token = self.pool.acquire(resource, exclude=tried)
+            if token is None:
+                # Every token is limited: return the last limited response, or
+                # fall back to the original credentials
+                return response if response is not None else self.inner.send(request, **kwargs)
+
+            request.headers["Authorization"] = f"{scheme or 'token'} {token.token}"
+            response = self.inner.send(request, **kwargs)
+            if not self.pool.observe(token, resource, response):
+                return response
+            tried += (token,)
+
+    def close(self) -> None:
+        """Close the wrapped adapter."""
+        self.inner.close()
+
+
+def app_installation_provider(app_id: str, private_key: str, installation_id: int) -> Callable[[], Tuple[str, float]]:
+    """Provider minting GitHub App installation tokens on demand."""
+    integration = GithubIntegration(auth=Auth.AppAuth(app_id, private_key))
+
+    def provide() -> Tuple[str, float]:
+        authorization = integration.get_access_token(installation_id)
+        expires_at = authorization.expires_at.replace(tzinfo=authorization.expires_at.tzinfo or timezone.utc)
+        return authorization.token, expires_at.timestamp()
+
+    return provide
+
+
+def pool_from_env(primary_token: Optional[str] = None) -> Optional[TokenPool]:
+    """
+    Build a token pool from the environment.
+
+    GITHUB_TOKENS holds comma-separated personal access tokens (in addition
+    to the primary GITHUB_TOKEN). GitHub App installations are configured
+    with GITHUB_APP_ID, GITHUB_APP_PRIVATE_KEY (PEM contents or a file path)
+    and comma-separated GITHUB_APP_INSTALLATION_IDS.
+
+    Returns:
+        TokenPool, or None when nothing beyond the primary token is configured
+    """
+    tokens: List[PooledToken] = []
+    seen = set()
+    for value in [primary_token] + os.getenv("GITHUB_TOKENS", "").split(","):
+        value = (value or "").strip()
+        if value and value not in seen:
+            seen.add(value)
+            tokens.append(PooledToken(f"token-{len(tokens) + 1}", token=value))
+
+    app_id = os.getenv("GITHUB_APP_ID")
+    private_key = os.getenv("GITHUB_APP_PRIVATE_KEY", "")
+    if app_id and private_key:
+        if os.path.isfile(private_key):
+            with open(private_key) as f:
+                private_key = f.read()
+        for installation_id in os.getenv("GITHUB_APP_INSTALLATION_IDS", "").split(","):
+            if installation_id.strip():
+                tokens.append(PooledToken(
+                    f"app-installation-{installation_id.strip()}",
+                    provider=app_installation_provider(app_id, private_key, int(installation_id))
+                ))
+
+    if not tokens or (len(tokens) == 1 and primary_token):
+        return None
+    return TokenPool(tokens)
@@ -1,6 +1,6 @@
 'use client'
 
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import { useParams } from 'next/navigation'
 import Hero from '@/components/Hero'
 import StatsCard from '@/components/StatsCard'
@@ -31,11 +31,57 @@ export default function PortfolioPage() {
   const [theme, setTheme] = useState('minimal')
   const [showThemeSelector, setShowThemeSelector] = useState(false)
   const [refreshing, setRefreshing] = useState(false)
+  const [streaming, setStreaming] = useState(false)
+  const eventSourceRef = useRef(null)
 
   useEffect(() => {
     fetchProfile()
+    return () => closeStream()
   }, [username])
 
+  const closeStream = () => {
+    if (eventSourceRef.current) {
+      eventSourceRef.current.close()
+      eventSourceRef.current = null
+    }
+  }
+
+  // Analyze the profile, rendering each section as soon as the backend sends it
+  const streamAnalysis = () => new Promise((resolve, reject) => {
+    closeStream()
+    const source = new EventSource(`${API_URL}/analyze/${username}/stream`)
+    eventSourceRef.current = source
+    let finished = false
+
+    source.addEventListener('section', (event) => {
+      const { data } = JSON.parse(event.data)
+      setProfile(prev => ({ ...(prev || {}), ...data }))
+      // The page can render as soon as the profile basics arrive
+      setLoading(false)
+      setStreaming(true)
+      resolve()
+    })
+
+    source.addEventListener('done', () => {
+      finished = true
+      closeStream()
+      setStreaming(false)
+      resolve()
+    })
+
+    source.addEventListener('error', (event) => {
+      if (finished) return
+      finished = true
+      closeStream()
+      setStreaming(false)
+      // Server-sent error events carry a detail; connection errors do not
+      const detail = event.data ? JSON.parse(event.data).detail : null
+      const error = new Error(detail || 'Failed to analyze profile')
+      setError(error.message)
+      reject(error)
+    })
+  })
+
   const fetchProfile = async (forceRefresh = false) => {
     try {
       setLoading(true)
@@ -46,18 +92,10 @@ export default function PortfolioPage() {
       
       if (!response.ok) {
         // If not found or forcing refresh, analyze the profile
-        response = await fetch(`${API_URL}/analyze/${username}`)
-        
-        if (!response.ok) {
-          throw new Error('Failed to analyze profile')
+        if (!forceRefresh) {
+          setProfile(null)
         }
-        
-        const result = await response.json()
-        
-        // Wait a moment for chart files to be fully written
-        await new Promise(resolve => setTimeout(resolve, 500))
-        
-        setProfile(result.data)
+        await streamAnalysis()
       } else {
         const data = await response.json()
         setProfile(data)
@@ -197,11 +235,28 @@ export default function PortfolioPage() {
 
       {/* Main Content */}
       <div className="container mx-auto px-4 py-12 max-w-7xl">
+        {/* Sections still being analyzed */}
+        {streaming && (
+          <div className="flex items-center justify-center gap-3 mb-8 opacity-70">
+            <div className="animate-spin rounded-full h-5 w-5 border-2 border-purple-500 border-t-transparent"></div>
+            <span>Analyzing remaining sections...</span>
+          </div>
+        )}
+
+        {/* Cached profile past its soft TTL; the backend is refreshing it */}
+        {profile.stale && !streaming && (
+          <div className="text-center mb-8 text-sm opacity-70">
+            Showing data from {new Date(profile.analyzed_at).toLocaleDateString()}. A refresh is running in the background.
+          </div>
+        )}
+
         {/* Stats Section */}
-        <section className="mb-16">
-          <h2 className="text-3xl font-bold mb-8 text-center">GitHub Statistics</h2>
-          <StatsCard stats={profile.stats} theme={theme} />
-        </section>
+        {profile.stats && (
+          <section className="mb-16">
+            <h2 className="text-3xl font-bold mb-8 text-center">GitHub Statistics</h2>
+            <StatsCard stats={profile.stats} theme={theme} />
+          </section>
+        )}
 
         {/* Skills Section */}
         {profile.top_languages && profile.top_languages.length > 0 && (
@@ -214,29 +269,32 @@ export default function PortfolioPage() {
         )}
 
         {/* Charts Section */}
-        {profile.charts && (
+        {(profile.charts || profile.chart_specs) && (
           <section className="mb-16">
             <h2 className="text-3xl font-bold mb-8 text-center">Analytics</h2>
             <div className="grid md:grid-cols-2 gap-6">
-              {profile.charts.languages && (
+              {(profile.charts?.languages || profile.chart_specs?.languages) && (
                 <Chart
-                  src={`${API_URL}${profile.charts.languages}?t=${Date.now()}`}
+                  src={profile.charts?.languages && `${API_URL}${profile.charts.languages}`}
+                  specSrc={profile.chart_specs?.languages && `${API_URL}${profile.chart_specs.languages}`}
                   alt="Language Distribution"
                   title="Language Distribution"
                   theme={theme}
                 />
               )}
-              {profile.charts.stars && (
+              {(profile.charts?.stars || profile.chart_specs?.stars) && (
                 <Chart
-                  src={`${API_URL}${profile.charts.stars}?t=${Date.now()}`}
+                  src={profile.charts?.stars && `${API_URL}${profile.charts.stars}`}
+                  specSrc={profile.chart_specs?.stars && `${API_URL}${profile.chart_specs.stars}`}
                   alt="Star Growth"
                   title="Star Growth Timeline"
                   theme={theme}
                 />
               )}
-              {profile.charts.contributions && (
+              {(profile.charts?.contributions || profile.chart_specs?.contributions) && (
                 <Chart
-                  src={`${API_URL}${profile.charts.contributions}?t=${Date.now()}`}
+                  src={profile.charts?.contributions && `${API_URL}${profile.charts.contributions}`}
+                  specSrc={profile.chart_specs?.contributions && `${API_URL}${profile.chart_specs.contributions}`}
                   alt="Contribution Heatmap"
                   title="Contribution Activity"
                   theme={theme}
@@ -324,9 +382,11 @@ export default function PortfolioPage() {
           <p className="opacity-70">
             Generated by <span className="font-bold gradient-text">GitFolio AI</span>
           </p>
-          <p className="text-sm opacity-50 mt-2">
-            Last updated: {new Date(profile.analyzed_at).toLocaleDateString()}
-          </p>
+          {profile.analyzed_at && (
+            <p className="text-sm opacity-50 mt-2">
+              Last updated: {new Date(profile.analyzed_at).toLocaleDateString()}
+            </p>
+          )}
         </footer>
       </div>
     </div>
@@ -2,9 +2,13 @@
 
 import { motion } from 'framer-motion'
 import { useState, useEffect } from 'react'
+import SpecChart from './SpecChart'
 
-export default function Chart({ src, alt, title, theme = 'minimal' }) {
+// Draws the chart from specSrc (chart data JSON) when given, otherwise or
+// if that fails shows the server-rendered image at src
+export default function Chart({ src, specSrc, alt, title, theme = 'minimal' }) {
   const [imageSrc, setImageSrc] = useState(null)
+  const [spec, setSpec] = useState(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(false)
   
@@ -12,6 +16,7 @@ export default function Chart({ src, alt, title, theme = 'minimal' }) {
     let mounted = true
     let retries = 0
     const maxRetries = 5
+    let timer = null
     
     const loadImage = () => {
       const img = new Image()
@@ -33,14 +38,39 @@ export default function Chart({ src, alt, title, theme = 'minimal' }) {
       img.src = src
     }
     
-    // Start loading after a small delay
-    const timer = setTimeout(loadImage, 200)
+    const fallBack = () => {
+      if (!mounted) return
+      if (src) {
+        timer = setTimeout(loadImage, 200)
+      } else {
+        setError(true)
+        setLoading(false)
+      }
+    }
+    
+    if (specSrc) {
+      fetch(specSrc)
+        .then((response) => {
+          if (!response.ok) throw new Error(`HTTP ${response.status}`)
+          return response.json()
+        })
+        .then((data) => {
+          if (mounted) {
+            setSpec(data)
+            setLoading(false)
+          }
+        })
+        .catch(fallBack)
+    } else {
+      // Start loading after a small delay
+      timer = setTimeout(loadImage, 200)
+    }
     
     return () => {
       mounted = false
       clearTimeout(timer)
     }
-  }, [src])
+  }, [src, specSrc])
   
   const getThemeClasses = () => {
     switch (theme) {
@@ -91,9 +121,17 @@ export default function Chart({ src, alt, title, theme = 'minimal' }) {
             <p>Chart unavailable</p>
           </div>
         )}
-        {imageSrc && !error && (
+        {spec && !error && (
+          <div className="w-full p-4">
+            <SpecChart spec={spec} />
+          </div>
+        )}
+        {/* The server picks WebP or PNG from Accept, and 1x or 2x from w */}
+        {imageSrc && !spec && !error && (
           <img
             src={imageSrc}
+            srcSet={`${imageSrc}?w=600 600w, ${imageSrc} 1200w`}
+            sizes="(min-width: 768px) 50vw, 100vw"
             alt={alt}
             className="w-full h-auto"
           />
@@ -0,0 +1,108 @@
+'use client'
+
+import {
+  Chart as ChartJS,
+  ArcElement,
+  CategoryScale,
+  Filler,
+  Legend,
+  LinearScale,
+  LineElement,
+  PointElement,
+  Tooltip,
+} from 'chart.js'
+import { Line, Pie } from 'react-chartjs-2'
+
+ChartJS.register(ArcElement, CategoryScale, Filler, Legend, LinearScale, LineElement, PointElement, Tooltip)
+
+// Cell color of a heatmap value (0..1), from the light to the dark end of "Greens"
+const greens = (t) => {
+  const light = [247, 252, 245]
+  const dark = [0, 68, 27]
+  const [r, g, b] = light.map((c, i) => Math.round(c + (dark[i] - c) * t))
+  return `rgb(${r}, ${g}, ${b})`
+}
+
+function PieSpec({ spec }) {
+  const data = {
+    labels: spec.labels,
+    datasets: [{ data: spec.values, backgroundColor: spec.colors, borderColor: '#fff', borderWidth: 2 }],
+  }
+  const options = {
+    plugins: {
+      legend: { position: 'bottom' },
+      tooltip: { callbacks: { label: (ctx) => `${ctx.label}: ${ctx.parsed}${spec.unit || ''}` } },
+    },
+  }
+  return <Pie data={data} options={options} />
+}
+
+function LineSpec({ spec }) {
+  const data = {
+    labels: spec.x,
+    datasets: [{
+      data: spec.y,
+      borderColor: spec.color,
+      backgroundColor: `${spec.color}4d`,
+      pointBackgroundColor: spec.color,
+      fill: true,
+      tension: 0.2,
+    }],
+  }
+  const options = {
+    plugins: { legend: { display: false } },
+    scales: {
+      x: { title: { display: true, text: spec.x_label } },
+      y: { title: { display: true, text: spec.y_label }, beginAtZero: true },
+    },
+  }
+  return <Line data={data} options={options} />
+}
+
+function HeatmapSpec({ spec }) {
+  const columns = spec.columns.length
+  const max = Math.max(...spec.values) || 1
+
+  return (
+    <div className="w-full overflow-x-auto text-xs text-gray-500">
+      <div
+        className="grid gap-[2px] min-w-[480px]"
+        style={{ gridTemplateColumns: `2.5rem repeat(${columns}, minmax(0, 1fr))` }}
+      >
+        {spec.rows.map((row, r) => [
+          <div key={`label-${row}`} className="pr-1 text-right leading-4">{row}</div>,
+          ...spec.columns.map((column, c) => {
+            const value = spec.values[r * columns + c]
+            return (
+              <div
+                key={`${row}-${column}`}
+                className="h-4 rounded-sm"
+                style={{ backgroundColor: greens(value / max) }}
+                title={`${row} ${column}: ${value} ${spec.value_label.toLowerCase()}`}
+              />
+            )
+          }),
+        ])}
+        <div />
+        {spec.columns.map((column, c) => (
+          <div key={`hour-${column}`} className="text-center">{c % 3 === 0 ? column.slice(0, 2) : ''}</div>
+        ))}
+      </div>
+      <p className="mt-2 text-center">{spec.x_label}</p>
+    </div>
+  )
+}
+
+// Draws a chart from the spec returned by GET /charts/{username}/{chart}.json
+export default function SpecChart({ spec }) {
+  switch (spec.type) {
+    case 'pie':
+      return <PieSpec spec={spec} />
+    case 'line':
+      return <LineSpec spec={spec} />
+    case 'heatmap':
+      return <HeatmapSpec spec={spec} />
+    default:
+      return null
+  }
+}